@@ -1,7 +1,11 @@
-import tkinter as tk
-from tkinter import ttk
 import random
 import string
+import csv
+import json
+import threading
+
+# Tkinter is imported by load_tkinter() when the GUI starts, so the booking classes can be used without it
+tk = ttk = None
 
 
 # Utility Functions
@@ -10,26 +14,182 @@ def generate_taxi_id():
     """Generate a random alphanumeric Taxi ID with up to 5 characters."""
     return ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
 
+def generate_taxi_ids(count, existing=()):
+    """Generate count distinct random Taxi IDs in one batch, skipping any already in existing."""
+    taxi_ids = set()
+    while len(taxi_ids) < count:
+        chars = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5 * (count - len(taxi_ids))))
+        for i in range(0, len(chars), 5):
+            taxi_id = chars[i:i + 5]
+            if taxi_id not in existing:
+                taxi_ids.add(taxi_id)
+    return list(taxi_ids)
+
+def fleet_row(location, fare):
+    """Return a (location, fare) row with a whole, non-negative fare, or raise ValueError."""
+    if isinstance(fare, str):
+        fare = int(fare.strip())
+    elif isinstance(fare, float) and fare.is_integer():
+        fare = int(fare)
+    if isinstance(fare, bool) or not isinstance(fare, int) or fare < 0:
+        raise ValueError(f"Fare {fare!r} is not a whole number of francs")
+    if not isinstance(location, str) or not location:
+        raise ValueError(f"Location {location!r} is not a place name")
+    return location, fare
+
+def read_fleet_file(path):
+    """Read (location, fare) rows from a CSV file with location,fare columns or a JSON list."""
+    with open(path, newline="") as fleet_file:
+        if path.lower().endswith(".json"):
+            records = json.load(fleet_file)
+            return [fleet_row(record["location"], record["fare"]) if isinstance(record, dict) else fleet_row(*record) for record in records]
+        return [fleet_row(row["location"], row["fare"]) for row in csv.DictReader(fleet_file)]
+
+# Taxi ID Search Index
+
+class SubstringIndex:
+    """N-gram index over Taxi IDs so substring and prefix filters only touch matching IDs."""
+    def __init__(self, n=3):
+        self.n = n
+        self.grams = {}  # Every substring of up to n characters -> set of Taxi IDs containing it
+
+    def _grams(self, text):
+        return {text[i:i + k] for k in range(1, self.n + 1) for i in range(len(text) - k + 1)}
+
+    def add(self, taxi_id):
+        for gram in self._grams(taxi_id):
+            self.grams.setdefault(gram, set()).add(taxi_id)
+
+    def remove(self, taxi_id):
+        for gram in self._grams(taxi_id):
+            ids = self.grams[gram]
+            ids.discard(taxi_id)
+            if not ids:
+                del self.grams[gram]
+
+    def search(self, query):
+        """Return the set of indexed Taxi IDs that contain query."""
+        if len(query) <= self.n:
+            return set(self.grams.get(query, ()))
+        # Longer queries: intersect the postings of their n-grams, smallest first, then verify
+        postings = sorted((self.grams.get(query[i:i + self.n], set()) for i in range(len(query) - self.n + 1)), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return {taxi_id for taxi_id in candidates if query in taxi_id}
+
+# Doubly Linked List
+
+class ListNode:
+    __slots__ = ("value", "prev", "next", "owner")
+
+    def __init__(self, value, owner):
+        self.value = value
+        self.prev = None
+        self.next = None
+        self.owner = owner  # List this node was last linked into
+
+class DoublyLinkedList:
+    """Doubly linked list with O(1) append, popleft, unlink of any node and splicing of whole lists."""
+    def __init__(self, container=None):
+        self.container = container  # Object that holds this list, e.g. the Taxi whose manifest it is
+        self.head = None
+        self.tail = None
+        self.size = 0
+        self.merged_into = None  # Set once this list's nodes have been spliced into another list
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        node = self.head
+        while node:
+            yield node.value
+            node = node.next
+
+    def append(self, value):
+        """Add value at the end of the list and return its node, which can later be unlinked."""
+        node = ListNode(value, self)
+        if self.tail:
+            self.tail.next = node
+            node.prev = self.tail
+        else:
+            self.head = node
+        self.tail = node
+        self.size += 1
+        return node
+
+    def popleft(self):
+        """Remove and return the first value, or None if the list is empty."""
+        node = self.head
+        if node is None:
+            return None
+        self.unlink(node)
+        return node.value
+
+    def unlink(self, node):
+        """Remove a node of this list in O(1)."""
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        node.prev = node.next = node.owner = None
+        self.size -= 1
+
+    def splice(self, other):
+        """Move every node of other onto the end of this list in O(1). other must not be reused."""
+        if other.head:
+            if self.tail:
+                self.tail.next = other.head
+                other.head.prev = self.tail
+            else:
+                self.head = other.head
+            self.tail = other.tail
+            self.size += other.size
+        other.head = other.tail = None
+        other.size = 0
+        other.merged_into = self
+
+    @staticmethod
+    def owner_of(node):
+        """Return the list a node belongs to now, following any splices since it was appended."""
+        owner = node.owner
+        while owner.merged_into is not None:
+            owner = owner.merged_into
+        node.owner = owner  # Shortcut the chain for the next lookup
+        return owner
+
 # Car and Passenger Management
 
 class Passenger:
+    __slots__ = ("passenger_number", "booking_number", "manifest_node", "queue_node")
+
     def __init__(self, passenger_number):
         self.passenger_number = passenger_number
+        self.booking_number = None  # Set when the booking is queued, and used to cancel it
+        self.manifest_node = None  # Node in the taxi's passenger manifest
+        self.queue_node = None  # Node in the ride queue while waiting for pickup
 
 class Taxi:
+    __slots__ = ("taxi_id", "location", "fare", "passengers", "capacity", "lock")
+
     def __init__(self, taxi_id, location, fare):
         self.taxi_id = taxi_id
         self.location = location
         self.fare = fare
-        self.passengers = []
+        self.passengers = DoublyLinkedList(self)
         self.capacity = 28  # Each taxi has a capacity of 28 passengers
+        self.lock = threading.RLock()  # Held while changing this taxi's manifest
 
     def assign_passenger(self, passenger):
         """Assign a passenger to this taxi if space is available."""
-        if len(self.passengers) < self.capacity:
-            self.passengers.append(passenger)
-            return True
-        return False
+        with self.lock:
+            if len(self.passengers) < self.capacity:
+                passenger.manifest_node = self.passengers.append(passenger)
+                return True
+            return False
 
     def available_slots(self):
         """Return the number of available slots for passengers."""
@@ -39,45 +199,270 @@ class Taxi:
         """Check if the taxi is full."""
         return len(self.passengers) == self.capacity
 
+class SeatIndex:
+    """Buckets the taxis of each route by free seats, so a non-full taxi is found without scanning."""
+    def __init__(self):
+        self.routes = {}  # Location -> {free seats: {Taxi ID: Taxi}}, full taxis and empty buckets left out
+
+    def add(self, taxi, free_seats=None):
+        if free_seats is None:
+            free_seats = taxi.available_slots()
+        if free_seats > 0:
+            self.routes.setdefault(taxi.location, {}).setdefault(free_seats, {})[taxi.taxi_id] = taxi
+
+    def remove(self, taxi, free_seats=None):
+        if free_seats is None:
+            free_seats = taxi.available_slots()
+        buckets = self.routes.get(taxi.location)
+        if not buckets or free_seats not in buckets:
+            return
+        bucket = buckets[free_seats]
+        bucket.pop(taxi.taxi_id, None)
+        if not bucket:
+            del buckets[free_seats]
+            if not buckets:
+                del self.routes[taxi.location]
+
+    def update(self, taxi, old_free_seats):
+        """Move a taxi to the bucket for its current free seats after passengers came or went."""
+        self.remove(taxi, old_free_seats)
+        self.add(taxi)
+
+    def find(self, location, fullest_first=True):
+        """Return a non-full taxi on a route, the fullest or the emptiest one, or None.
+
+        There is one bucket per free-seat count, so this looks at no more than capacity buckets.
+        """
+        buckets = self.routes.get(location)
+        if not buckets:
+            return None
+        free_seats = min(buckets) if fullest_first else max(buckets)
+        return next(iter(buckets[free_seats].values()))
+
 class TaxiBookingSystem:
     def __init__(self):
         self.taxis = []
+        self.taxi_index = {}  # Taxi ID -> Taxi
+        self.id_search = SubstringIndex()  # Substring search over Taxi IDs
+        self.seat_index = SeatIndex()  # Non-full taxis of each route bucketed by free seats
+        self.ride_queue = DoublyLinkedList()  # Booked passengers waiting for pickup, oldest first
+        self.booking_counter = 0
+        self.passenger_handles = {}  # Phone number -> {booking number: Passenger} of its waiting bookings, oldest first
         # Removed booking history, not stored in memory anymore
+        # Guards the indexes, ride queue and handles. Manifests are guarded by each taxi's own
+        # lock, so bookings for different taxis only contend here briefly. Always take taxi
+        # locks before this one, never the other way round.
+        self.lock = threading.RLock()
 
     def add_taxi(self, location, fare):
         """Add a new taxi with a random Taxi ID to the system."""
-        taxi_id = generate_taxi_id()
-        taxi = Taxi(taxi_id, location, fare)
+        with self.lock:
+            taxi_id = generate_taxi_id()
+            while taxi_id in self.taxi_index:  # Random IDs can collide, draw a new one
+                taxi_id = generate_taxi_id()
+            self._index_taxi(Taxi(taxi_id, location, fare))
+            return taxi_id
+
+    def add_taxis(self, locations_with_fares):
+        """Add many taxis at once with a single batch of new Taxi IDs."""
+        rows = list(locations_with_fares)
+        with self.lock:
+            taxi_ids = generate_taxi_ids(len(rows), self.taxi_index)
+            for taxi_id, (location, fare) in zip(taxi_ids, rows):
+                self._index_taxi(Taxi(taxi_id, location, fare))
+        return taxi_ids
+
+    def _index_taxi(self, taxi):
         self.taxis.append(taxi)
+        self.taxi_index[taxi.taxi_id] = taxi
+        self.id_search.add(taxi.taxi_id)
+        self.seat_index.add(taxi)
+
+    def load_fleet(self, path):
+        """Import a fleet from a CSV or JSON file of taxi locations and fares."""
+        return self.add_taxis(read_fleet_file(path))
 
     def request_ride(self, passenger_number, taxi_id):
         """Request a ride for a passenger based on chosen Taxi ID."""
+        taxi = self.taxi_index.get(taxi_id)
+        if taxi is None:
+            return None, None, None
         passenger = Passenger(passenger_number)
-
-        for taxi in self.taxis:
-            if taxi.taxi_id == taxi_id:
-                if not taxi.is_full():
-                    if taxi.assign_passenger(passenger):
-                        return taxi.taxi_id, taxi.location, taxi.fare  # Return taxi ID, location, and fare
+        # Check and take the seat under the taxi's lock, so concurrent requests cannot overbook it
+        with taxi.lock:
+            if taxi.is_full():
+                return taxi.taxi_id, "Taxi is full", None
+            free_seats = taxi.available_slots()
+            taxi.assign_passenger(passenger)
+            with self.lock:
+                self.seat_index.update(taxi, free_seats)
+                self._queue(passenger)
+        return taxi.taxi_id, taxi.location, taxi.fare  # Return taxi ID, location, and fare
+
+    def request_rides_batch(self, requests):
+        """Book many (passenger number, Taxi ID) requests in one pass.
+
+        Requests are grouped by taxi, so each taxi's seat index entry is updated once.
+        Returns the request_ride result of each request, in the same order.
+        """
+        results = [None] * len(requests)
+        passengers = [None] * len(requests)
+        positions_by_taxi = {}
+        for position, (_, taxi_id) in enumerate(requests):
+            positions_by_taxi.setdefault(taxi_id, []).append(position)
+
+        for taxi_id, positions in positions_by_taxi.items():
+            taxi = self.taxi_index.get(taxi_id)
+            if taxi is None:
+                for position in positions:
+                    results[position] = (None, None, None)
+                continue
+            with taxi.lock:
+                free_seats = taxi.available_slots()
+                for position in positions[:free_seats]:
+                    passenger = passengers[position] = Passenger(requests[position][0])
+                    taxi.assign_passenger(passenger)
+                    results[position] = (taxi.taxi_id, taxi.location, taxi.fare)
+                for position in positions[free_seats:]:
+                    results[position] = (taxi.taxi_id, "Taxi is full", None)
+                if free_seats:
+                    with self.lock:
+                        self.seat_index.update(taxi, free_seats)
+
+        # Queue the booked passengers in request order
+        with self.lock:
+            for passenger in passengers:
+                if passenger is not None:
+                    self._queue(passenger)
+        return results
+
+    def request_any_ride(self, passenger_number, location, fullest_first=True):
+        """Book a seat on any non-full taxi serving location, filling the fullest taxi first by default."""
+        while True:
+            with self.lock:
+                taxi = self.seat_index.find(location, fullest_first)
+            if taxi is None:
+                return None, None, None
+            result = self.request_ride(passenger_number, taxi.taxi_id)
+            if result[2] is not None:
+                return result
+            # Another thread filled the taxi after it was found, so look again
+
+    def _queue(self, passenger):
+        """Put a seated passenger at the back of the ride queue under a new booking number."""
+        self.booking_counter += 1
+        passenger.booking_number = self.booking_counter
+        passenger.queue_node = self.ride_queue.append(passenger)
+        self.passenger_handles.setdefault(passenger.passenger_number, {})[passenger.booking_number] = passenger
+
+    def _release_handle(self, passenger):
+        handles = self.passenger_handles[passenger.passenger_number]
+        del handles[passenger.booking_number]
+        if not handles:
+            del self.passenger_handles[passenger.passenger_number]
+
+    def waiting_bookings(self, passenger_number):
+        """Return the booking numbers of this phone number's rides still waiting for pickup, oldest first."""
+        with self.lock:
+            return list(self.passenger_handles.get(passenger_number, ()))
+
+    def cancel_ride(self, passenger_number, booking_number=None):
+        """Cancel a waiting ride booked with this phone number, freeing its seat. Returns True on success.
+
+        booking_number picks the booking to cancel in O(1). Without it, the latest booking is cancelled.
+        """
+        while True:
+            with self.lock:
+                handles = self.passenger_handles.get(passenger_number)
+                if not handles:
+                    return False
+                if booking_number is None:
+                    passenger = handles[next(reversed(handles))]
                 else:
-                    return taxi.taxi_id, "Taxi is full", None
-        return None, None, None
+                    passenger = handles.get(booking_number)
+                    if passenger is None:
+                        return False
+                taxi = DoublyLinkedList.owner_of(passenger.manifest_node).container
+            with taxi.lock, self.lock:
+                # Start over if the passenger was picked up or transferred before the taxi was locked
+                if passenger.queue_node is None:
+                    continue
+                manifest = DoublyLinkedList.owner_of(passenger.manifest_node)
+                if manifest.container is not taxi:
+                    continue
+                self._release_handle(passenger)
+                self.ride_queue.unlink(passenger.queue_node)
+                passenger.queue_node = None
+                free_seats = taxi.available_slots()
+                manifest.unlink(passenger.manifest_node)
+                passenger.manifest_node = None
+                self.seat_index.update(taxi, free_seats)
+                return True
+
+    def next_ride(self):
+        """Take the oldest waiting passenger off the ride queue for pickup, or None if nobody is waiting."""
+        with self.lock:
+            passenger = self.ride_queue.popleft()
+            if passenger is None:
+                return None
+            passenger.queue_node = None
+            self._release_handle(passenger)
+            return passenger
+
+    def transfer_passengers(self, from_taxi_id, to_taxi_id):
+        """Move every passenger of a broken-down taxi to another taxi on the same route in O(1). Returns True on success.
+
+        Passengers booked and paid for one route, so a taxi on a different route is refused.
+        """
+        source = self.taxi_index.get(from_taxi_id)
+        target = self.taxi_index.get(to_taxi_id)
+        if source is None or target is None or source is target or source.location != target.location:
+            return False
+        # Lock both taxis in Taxi ID order, so two opposite transfers cannot deadlock
+        first, second = sorted((source, target), key=lambda taxi: taxi.taxi_id)
+        with first.lock, second.lock, self.lock:
+            if target.available_slots() < len(source.passengers):
+                return False
+            source_free_seats = source.available_slots()
+            target_free_seats = target.available_slots()
+            target.passengers.splice(source.passengers)
+            source.passengers = DoublyLinkedList(source)
+            self.seat_index.update(source, source_free_seats)
+            self.seat_index.update(target, target_free_seats)
+            return True
+
+    def _taxi_row(self, taxi):
+        return (taxi.taxi_id, taxi.location, taxi.fare, len(taxi.passengers), taxi.available_slots())
+
+    def view_taxis(self, limit=None):
+        """View all taxis and their passenger counts, or only the first limit of them."""
+        with self.lock:
+            return [self._taxi_row(taxi) for taxi in self.taxis[:limit]]
 
-    def view_taxis(self):
-        """View all taxis and their passenger counts."""
-        taxi_info = []
-        for taxi in self.taxis:
-            slots_used = len(taxi.passengers)
-            taxi_info.append((taxi.taxi_id, taxi.location, taxi.fare, slots_used, taxi.available_slots()))
-        return taxi_info
+    def find_taxis(self, taxi_id_filter, limit=None):
+        """View the taxis whose Taxi ID contains taxi_id_filter, sorted by Taxi ID, or only the first limit of them."""
+        if not taxi_id_filter:
+            return self.view_taxis(limit)
+        with self.lock:
+            taxi_ids = sorted(self.id_search.search(taxi_id_filter))[:limit]
+            return [self._taxi_row(self.taxi_index[taxi_id]) for taxi_id in taxi_ids]
 
 
 # Tkinter GUI Implementation
 
+def load_tkinter():
+    """Import Tkinter the first time the GUI needs it."""
+    global tk, ttk
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk
+
 class TaxiBookingApp:
     def __init__(self, root, system):
+        load_tkinter()
         self.root = root
         self.system = system
+        self.view_limit = 500  # Taxis shown in the list, so a large fleet does not stall every refresh
 
         # Configure full-screen mode
         self.root.attributes('-fullscreen', True)
@@ -120,6 +505,8 @@ class TaxiBookingApp:
 
         self.filter_entry = tk.Entry(self.filter_frame, font=("Helvetica", 14), bd=2, relief=tk.GROOVE)
         self.filter_entry.pack(side=tk.LEFT, padx=10)
+        self.filter_entry.bind("<KeyRelease>", self.schedule_filter)
+        self.filter_job = None  # Pending debounced filter, if any
 
         self.filter_button = tk.Button(self.filter_frame, text="Filter", font=("Helvetica", 14, "bold"), bg="#2980b9", fg="white", command=self.filter_by_taxi_id)
         self.filter_button.pack(side=tk.LEFT, padx=10)
@@ -160,18 +547,16 @@ class TaxiBookingApp:
         """Close the application."""
         self.root.destroy()
 
+    def schedule_filter(self, event=None):
+        """Filter as the user types, waiting for a short pause so each keystroke does not redraw the list."""
+        if self.filter_job is not None:
+            self.root.after_cancel(self.filter_job)
+        self.filter_job = self.root.after(250, self.filter_by_taxi_id)
+
     def filter_by_taxi_id(self):
         """Filter the taxis list based on Taxi ID."""
-        taxi_id_filter = self.filter_entry.get().strip()
-        taxis = self.system.view_taxis()
-
-        filtered_taxis = [taxi for taxi in taxis if taxi_id_filter in taxi[0]]
-        
-        # Refresh the taxi list
-        for row in self.taxi_tree.get_children():
-            self.taxi_tree.delete(row)
-        for taxi in filtered_taxis:
-            self.taxi_tree.insert("", "end", values=taxi)
+        self.filter_job = None
+        self.refresh_ui()
 
     def book_ride(self):
         """Book a ride and assign a taxi."""
@@ -229,34 +614,34 @@ class TaxiBookingApp:
         popup.grab_set()  # Prevent interaction with the main window until this popup is closed
 
     def refresh_ui(self):
-        """Refresh the lists of taxis in the GUI."""
+        """Refresh the lists of taxis in the GUI, keeping the current Taxi ID filter."""
         # Refresh taxi list
-        for row in self.taxi_tree.get_children():
-            self.taxi_tree.delete(row)
-        taxis = self.system.view_taxis()
+        self.taxi_tree.delete(*self.taxi_tree.get_children())
+        taxis = self.system.find_taxis(self.filter_entry.get().strip(), limit=self.view_limit)
         for taxi in taxis:
             self.taxi_tree.insert("", "end", values=taxi)
 
 # Main Execution
+DEFAULT_FLEET = [
+    ("Kigali-Huye", 3900),
+    ("Kigali-Musanze", 3500),
+    ("Kigali-Nyagatare", 4000),
+    ("Kigali-Rusizi", 9000),
+    ("Huye-Kigali", 3900),
+    ("Musanze-Kigali", 3500),
+    ("Nyagatare-Kigali", 4000),
+    ("Rusizi-Kigali", 9000),
+]
+
 
 def main():
     system = TaxiBookingSystem()
 
     # Add some taxis with predefined locations and fares
-    locations_with_fares = [
-        ("Kigali-Huye", 3900),
-        ("Kigali-Musanze", 3500),
-        ("Kigali-Nyagatare", 4000),
-        ("Kigali-Rusizi", 9000),
-        ("Huye-Kigali", 3900),
-        ("Musanze-Kigali", 3500),
-        ("Nyagatare-Kigali", 4000),
-        ("Rusizi-Kigali", 9000),
-    ]
-    for location, fare in locations_with_fares:
-        system.add_taxi(location, fare)
+    system.add_taxis(DEFAULT_FLEET)
 
     # Create the Tkinter window and app
+    load_tkinter()
     root = tk.Tk()
     app = TaxiBookingApp(root, system)
 
@@ -1,47 +1,632 @@
-import tkinter as tk
-from tkinter import ttk
-import heapq
+from bisect import bisect_left, insort
+from collections import deque
+from contextlib import contextmanager
+import gc
+from heapq import heapify, heappop, heapreplace, merge
+from itertools import islice
+from math import ceil
+import os
+import struct
+import time
+
+# Tkinter is imported by load_tkinter() when the GUI starts, so the booking classes can be used without it
+tk = ttk = None
+
+
+# Ordered view of the waiting bookings, kept up to date as bookings come and go
+class SortedView:
+    """Unique, comparable items kept in sorted order, split into sorted chunks of bounded size.
+
+    Finding an item bisects the chunks' last items and then the chunk, and inserting or deleting
+    it moves at most one chunk's worth of list entries, so both stay close to the cost of a
+    heap push without the per-node objects of a tree. Iterating from the front costs O(1) per item.
+    """
+    CHUNK_SIZE = 512  # A chunk is split in two once it holds twice this many items
+
+    def __init__(self, items=()):
+        """Start from items that are already sorted."""
+        items = list(items)
+        size = self.CHUNK_SIZE
+        self.chunks = [items[index:index + size] for index in range(0, len(items), size)]
+        self.maxes = [chunk[-1] for chunk in self.chunks]  # Last item of each chunk
+        self.size = len(items)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from chunk
+
+    def first(self):
+        return self.chunks[0][0]
+
+    def insert(self, item):
+        chunks, maxes = self.chunks, self.maxes
+        self.size += 1
+        if not chunks:
+            chunks.append([item])
+            maxes.append(item)
+            return
+        index = bisect_left(maxes, item)
+        if index == len(maxes):
+            index -= 1
+            chunks[index].append(item)
+            maxes[index] = item
+        else:
+            insort(chunks[index], item)
+        chunk = chunks[index]
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            half = self.CHUNK_SIZE
+            chunks[index:index + 1] = [chunk[:half], chunk[half:]]
+            maxes.insert(index, chunk[half - 1])
+
+    def delete(self, item):
+        """Remove item, which must be in the view."""
+        chunks, maxes = self.chunks, self.maxes
+        index = bisect_left(maxes, item)
+        chunk = chunks[index]
+        del chunk[bisect_left(chunk, item)]
+        self.size -= 1
+        if not chunk:
+            del chunks[index]
+            del maxes[index]
+        else:
+            maxes[index] = chunk[-1]
 
 
-class RideShareHeap:
+# Bookings are tuples of (rank, booking counter, phone number, start, destination, priority, booked at).
+# Lanes serve them in (rank, booking counter) order, see RideShareHeap._rank. Counters are unique,
+# so bookings compare in that order as they are and the lanes can sort the bookings themselves.
+def view_row(booking):
+    return booking[2], booking[5], booking[3], booking[4]
+
+class BookingLane:
+    """Waiting bookings for one destination, kept in the order they will be served.
+
+    The view holds the bookings sorted, so the next one to serve is at its front, and bookings
+    finds any waiting booking by its counter, so it can be removed or re-prioritized with one
+    bisect into the view.
+    """
     def __init__(self):
+        self.view = SortedView()  # Waiting bookings in serve order
+        self.bookings = {}  # Booking counter -> waiting booking
+
+    @classmethod
+    def from_bookings(cls, bookings):
+        """Build a lane from bookings in any order, with one sort instead of one insert per booking."""
+        lane = cls()
+        lane.extend(bookings)
+        return lane
+
+    def __len__(self):
+        return len(self.bookings)
+
+    def push(self, booking):
+        self.bookings[booking[1]] = booking
+        self.view.insert(booking)
+
+    def extend(self, bookings):
+        """Add many bookings at once: one insert each when they are few next to the lane, else one sort."""
+        if len(bookings) < len(self.bookings) // 8:
+            for booking in bookings:
+                self.push(booking)
+            return
+        self.bookings.update((booking[1], booking) for booking in bookings)
+        items = list(self.view)
+        items.extend(bookings)
+        items.sort()  # The lane's bookings are already one sorted run, so this mostly sorts the new ones
+        self.view = SortedView(items)
+
+    def get(self, booking_number):
+        return self.bookings[booking_number]
+
+    def remove(self, booking_number):
+        """Remove and return a waiting booking."""
+        booking = self.bookings.pop(booking_number)
+        self.view.delete(booking)
+        return booking
+
+    def replace(self, booking):
+        """Swap in a changed copy of a waiting booking, with the same counter, at its new place in the order."""
+        self.view.delete(self.bookings[booking[1]])
+        self.view.insert(booking)
+        self.bookings[booking[1]] = booking
+
+
+# Write-Ahead Log
+@contextmanager
+def paused_gc():
+    """Pause the cyclic garbage collector while building many bookings.
+
+    Bookings are tuples of strings and numbers, and the lanes and indexes that hold them never
+    form cycles, so the collector's repeated passes over millions of new objects find nothing.
+    """
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if collecting:
+            gc.enable()
+
+def encode_field(text, size):
+    """Encode text as UTF-8 for a fixed-width journal field, refusing text that would not fit whole."""
+    if not isinstance(text, str):
+        raise ValueError(f"{text!r} is not text")
+    data = text.encode()
+    if len(data) > size:
+        raise ValueError(f"{text!r} is longer than {size} bytes")
+    return data
+
+class FieldText(dict):
+    """Raw journal field -> decoded text, decoding each distinct field once."""
+    def __missing__(self, raw):
+        text = self[raw] = raw.rstrip(b"\0").decode()
+        return text
+
+class BookingJournal:
+    """Write-ahead log of RideShareHeap operations, with a compact snapshot of the waiting bookings.
+
+    Adds, removals (served or cancelled bookings) and priority changes are appended to the log
+    before their result is returned. snapshot() writes just the waiting bookings to
+    path + ".snapshot" and empties the log, so recovery reads one snapshot plus the recent log.
+    """
+    RECORD = struct.Struct("<BIBd16s32s32s")  # operation, booking counter, priority, booking time, phone number, start, destination
+    ADD, REMOVE, CHANGE, COUNTER = range(4)
+
+    def __init__(self, path, sync_every=64):
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.sync_every = sync_every
+        self.pending = 0
+        self.file = open(path, "ab")
+        # Drop a partially written record left behind by a crash
+        self.file.truncate(self.file.tell() - self.file.tell() % self.RECORD.size)
+        self.entries = self.file.tell() // self.RECORD.size  # Records logged since the last snapshot
+
+    def _encode_add(self, booking):
+        _, number, phone_number, start, destination, priority, booked_at = booking
+        return self.RECORD.pack(self.ADD, number, priority, booked_at, encode_field(str(phone_number), 16), encode_field(start, 32), encode_field(destination, 32))
+
+    def _write(self, data, count):
+        self.file.write(data)
+        self.file.flush()
+        self.entries += count
+        self.pending += count
+        if self.pending >= self.sync_every:
+            self.sync()
+
+    def log_adds(self, bookings):
+        self._write(b"".join(self._encode_add(booking) for booking in bookings), len(bookings))
+
+    def log_removes(self, booking_numbers):
+        self._write(b"".join(self.RECORD.pack(self.REMOVE, number, 0, 0.0, b"", b"", b"") for number in booking_numbers), len(booking_numbers))
+
+    def log_change(self, booking_number, priority):
+        self._write(self.RECORD.pack(self.CHANGE, booking_number, priority, 0.0, b"", b"", b""), 1)
+
+    def recover(self):
+        """Replay the snapshot and the log. Returns the booking counter and the waiting bookings.
+
+        Waiting bookings are returned as {booking counter: [priority, phone number, start, destination, booked at]}.
+        """
+        booking_counter = 0
+        snapshot_counter = 0
+        waiting = {}
+        places = FieldText()  # Starts and destinations repeat, so most records reuse their text
+        for path in (self.snapshot_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as journal_file:
+                data = journal_file.read()
+            data = data[:len(data) - len(data) % self.RECORD.size]
+            for operation, number, priority, booked_at, phone_number, start, destination in self.RECORD.iter_unpack(data):
+                if operation == self.ADD:
+                    # A crash between writing a snapshot and emptying the log leaves adds the snapshot already has
+                    if number > snapshot_counter:
+                        waiting[number] = [priority, phone_number.rstrip(b"\0").decode(), places[start], places[destination], booked_at]
+                        if number > booking_counter:
+                            booking_counter = number
+                elif operation == self.REMOVE:
+                    waiting.pop(number, None)
+                elif operation == self.CHANGE:
+                    if number in waiting:
+                        waiting[number][0] = priority
+                else:
+                    snapshot_counter = number
+                    if number > booking_counter:
+                        booking_counter = number
+        return booking_counter, waiting
+
+    def snapshot(self, booking_counter, bookings):
+        """Replace the snapshot with these waiting bookings and empty the log."""
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "wb") as snapshot_file:
+            snapshot_file.write(b"".join(self._encode_add(booking) for booking in bookings))
+            snapshot_file.write(self.RECORD.pack(self.COUNTER, booking_counter, 0, 0.0, b"", b"", b""))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        self.file.truncate(0)
+        self.entries = 0
+        self.pending = 1
+        self.sync()
+
+    def sync(self):
+        """Force every logged operation onto disk."""
+        if self.pending:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+
+# Metrics
+class HeapMetrics:
+    """Latency histograms, throughput counters and depth gauges for one RideShareHeap.
+
+    Latencies are counted in power-of-two buckets: bucket b holds the calls that took
+    under 2**b nanoseconds, so recording a call is one bit_length and a few increments.
+    """
+    OPERATIONS = ("add_booking", "add_bookings", "serve_batch", "view_bookings", "cancel_booking", "change_priority")
+
+    def __init__(self, depth_by_priority):
+        self.started = time.perf_counter()
+        self.latency = {operation: [0] * 64 for operation in self.OPERATIONS}  # Operation -> calls per bucket
+        self.total_ns = dict.fromkeys(self.OPERATIONS, 0)  # Operation -> nanoseconds spent in it
+        self.added = self.served = self.cancelled = 0
+        self.depth_by_priority = depth_by_priority  # Priority number -> waiting bookings
+        self.waiting = self.max_waiting = sum(depth_by_priority.values())
+
+    def record(self, operation, elapsed_ns):
+        self.latency[operation][min(elapsed_ns.bit_length(), 63)] += 1
+        self.total_ns[operation] += elapsed_ns
+
+    def booking_added(self, priority):
+        self.added += 1
+        self.depth_by_priority[priority] = self.depth_by_priority.get(priority, 0) + 1
+        self.waiting += 1
+        if self.waiting > self.max_waiting:
+            self.max_waiting = self.waiting
+
+    def booking_removed(self, priority):
+        self.depth_by_priority[priority] -= 1
+        self.waiting -= 1
+
+    def priority_changed(self, old_priority, priority):
+        self.depth_by_priority[old_priority] -= 1
+        self.depth_by_priority[priority] = self.depth_by_priority.get(priority, 0) + 1
+
+    @staticmethod
+    def percentile(histogram, percentile):
+        """Return the upper bound, in seconds, of the bucket holding this percentile of the calls."""
+        rank = max(ceil(percentile / 100 * sum(histogram)), 1)
+        for bucket, count in enumerate(histogram):
+            rank -= count
+            if rank <= 0:
+                return 2 ** bucket / 1e9
+        return None
+
+    def report(self, priority_names, percentiles=(50, 90, 99)):
+        elapsed = time.perf_counter() - self.started
+        latency = {}
+        for operation, histogram in self.latency.items():
+            calls = sum(histogram)
+            if calls:
+                latency[operation] = {
+                    "calls": calls,
+                    "mean": self.total_ns[operation] / calls / 1e9,
+                    **{f"p{percentile}": self.percentile(histogram, percentile) for percentile in percentiles},
+                }
+        return {
+            "seconds": elapsed,
+            "latency": latency,
+            "added": self.added,
+            "served": self.served,
+            "cancelled": self.cancelled,
+            "added_per_second": self.added / elapsed if elapsed else 0.0,
+            "served_per_second": self.served / elapsed if elapsed else 0.0,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "depth": {name: self.depth_by_priority.get(priority, 0) for name, priority in priority_names.items()},
+        }
+
+
+class RideShareHeap:
+    def __init__(self, aging_interval=None, log_path=None, snapshot_every=100000):
         # Reverse the priority_map so that 'emergency' has the highest priority number
-        self.heap = []  # Min-heap to store bookings
         self.priority_map = {"low": 4, "medium": 3, "high": 2, "emergency": 5}  # emergency -> 5
         self.booking_counter = 0  # Unique counter to avoid conflicts in priority
+        # With an aging_interval, a waiting booking moves up one priority level for every
+        # aging_interval seconds it waits, so a steady stream of urgent bookings cannot starve
+        # the others. None, the default, serves by priority and then booking order.
+        self.aging_interval = aging_interval
+        self.lanes = {}  # Destination -> BookingLane of its waiting bookings
+        self.waiting = {}  # Booking counter -> destination of every waiting booking
+        self.bookings_by_phone = {}  # Phone number -> booking counters of its waiting bookings
+        self.wait_times = deque(maxlen=10000)  # (priority, seconds waited) of the latest served bookings
+        # Journal every change to a log file when one is given, and recover the queue it holds
+        self.snapshot_every = snapshot_every  # Logged operations between snapshots
+        self.journal = None
+        if log_path:
+            self.journal = BookingJournal(log_path)
+            self._recover()
+        self.metrics = None  # HeapMetrics while metrics are turned on
+
+    def enable_metrics(self):
+        """Start timing operations and tracking queue depth, from fresh counters."""
+        depth_by_priority = {}
+        for lane in self.lanes.values():
+            for booking in lane.view:
+                depth_by_priority[booking[5]] = depth_by_priority.get(booking[5], 0) + 1
+        self.metrics = HeapMetrics(depth_by_priority)
+
+    def disable_metrics(self):
+        self.metrics = None
+
+    def metrics_report(self, percentiles=(50, 90, 99)):
+        """Return latency percentiles in seconds, throughput and queue depth, or None when metrics are off."""
+        if self.metrics is None:
+            return None
+        return self.metrics.report(self.priority_map, percentiles)
+
+    def _recover(self):
+        """Rebuild the lanes from the journal, with one sort per destination."""
+        with paused_gc():
+            self.booking_counter, waiting = self.journal.recover()
+            interval = self.aging_interval
+            if interval is None:
+                bookings = [(priority, number, phone_number, start, destination, priority, booked_at)
+                            for number, (priority, phone_number, start, destination, booked_at) in waiting.items()]
+            else:
+                bookings = [(priority * interval + booked_at, number, phone_number, start, destination, priority, booked_at)
+                            for number, (priority, phone_number, start, destination, booked_at) in waiting.items()]
+            self.waiting = {booking[1]: booking[4] for booking in bookings}
+            bookings_by_destination = {}
+            bookings_by_phone = self.bookings_by_phone
+            for booking in bookings:
+                bookings_by_destination.setdefault(booking[4], []).append(booking)
+                counters = bookings_by_phone.get(booking[2])
+                if counters is None:
+                    bookings_by_phone[booking[2]] = {booking[1]}
+                else:
+                    counters.add(booking[1])
+            self.lanes = {destination: BookingLane.from_bookings(bookings) for destination, bookings in bookings_by_destination.items()}
+
+    def snapshot(self):
+        """Write the waiting bookings to the journal's snapshot and start a new, empty log."""
+        if self.journal is not None:
+            self.journal.snapshot(self.booking_counter, [booking for lane in self.lanes.values() for booking in lane.view])
+
+    def _logged(self):
+        if self.journal.entries >= self.snapshot_every:
+            self.snapshot()
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+
+    def __len__(self):
+        return len(self.waiting)
+
+    def _rank(self, priority, booked_at):
+        # Aging is linear, so comparing priority * aging_interval + booked_at gives the same order
+        # as comparing the aged priorities at any moment, and lane order never goes stale
+        if self.aging_interval is None:
+            return priority
+        return priority * self.aging_interval + booked_at
 
     def add_booking(self, phone_number, priority_level, start, destination):
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter_ns()
         self.booking_counter += 1
         priority = self.priority_map[priority_level]
-        booking = (priority, self.booking_counter, phone_number, start, destination)
-        heapq.heappush(self.heap, booking)
-        return f"Booking added: Phone={phone_number}, Priority={priority_level}, Route={start} → {destination}"
+        booked_at = time.time()
+        booking = (self._rank(priority, booked_at), self.booking_counter, phone_number, start, destination, priority, booked_at)
+        if self.journal is not None:
+            self.journal.log_adds([booking])
+        if destination not in self.lanes:
+            self.lanes[destination] = BookingLane()
+        self.lanes[destination].push(booking)
+        self.waiting[self.booking_counter] = destination
+        self.bookings_by_phone.setdefault(phone_number, set()).add(self.booking_counter)
+        if self.journal is not None:
+            self._logged()
+        if metrics is not None:
+            metrics.booking_added(priority)
+            metrics.record("add_booking", time.perf_counter_ns() - started)
+        return booking
+
+    def add_bookings(self, requests):
+        """Add many (phone number, priority level, start, destination) bookings, with one sort per lane.
+
+        Returns the new bookings, in the order they were given.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter_ns()
+        booked_at = time.time()
+        # Every booking in the batch is booked at the same time, so each level has one rank
+        ranks = {level: (self._rank(priority, booked_at), priority) for level, priority in self.priority_map.items()}
+        counter = self.booking_counter
+        bookings = []
+        bookings_by_destination = {}
+        with paused_gc():
+            for phone_number, priority_level, start, destination in requests:
+                counter += 1
+                rank, priority = ranks[priority_level]
+                booking = (rank, counter, phone_number, start, destination, priority, booked_at)
+                bookings.append(booking)
+                bookings_by_destination.setdefault(destination, []).append(booking)
+            self.booking_counter = counter
+            if self.journal is not None:
+                self.journal.log_adds(bookings)
+            for destination, lane_bookings in bookings_by_destination.items():
+                if destination not in self.lanes:
+                    self.lanes[destination] = BookingLane()
+                self.lanes[destination].extend(lane_bookings)
+            self.waiting.update({booking[1]: booking[4] for booking in bookings})
+            bookings_by_phone = self.bookings_by_phone
+            for booking in bookings:
+                counters = bookings_by_phone.get(booking[2])
+                if counters is None:
+                    bookings_by_phone[booking[2]] = {booking[1]}
+                else:
+                    counters.add(booking[1])
+        if self.journal is not None:
+            self._logged()
+        if metrics is not None:
+            for booking in bookings:
+                metrics.booking_added(booking[5])
+            metrics.record("add_bookings", time.perf_counter_ns() - started)
+        return bookings
+
+    def _forget(self, booking):
+        del self.waiting[booking[1]]
+        counters = self.bookings_by_phone[booking[2]]
+        counters.discard(booking[1])
+        if not counters:
+            del self.bookings_by_phone[booking[2]]
 
     def serve_booking(self):
-        if self.heap:
-            priority, counter, phone_number, start, destination = heapq.heappop(self.heap)
-            return f"Serving booking: Phone={phone_number}, Priority={priority}, Route={start} → {destination}"
-        else:
-            return "No bookings to serve."
+        """Serve the next booking. Returns it, or None when no bookings are waiting."""
+        served = self.serve_batch(1)
+        return served[0] if served else None
+
+    def serve_batch(self, n, destination=None):
+        """Serve up to n bookings in order, from one destination's lane or from all of them.
 
-    def view_bookings(self, destination_filter=None):
+        The lanes' front bookings are kept in a small heap, so this costs O(n log n) overall.
+        Returns the served bookings.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter_ns()
+        if destination is None:
+            lanes = self.lanes.values()
+        else:
+            lanes = [self.lanes[destination]] if destination in self.lanes else []
+        fronts = [(lane.view.first(), lane) for lane in lanes if lane.bookings]
+        heapify(fronts)
+        served = []
+        now = time.time()
+        while fronts and len(served) < n:
+            booking, lane = fronts[0]
+            lane.remove(booking[1])
+            self._forget(booking)
+            self.wait_times.append((booking[5], now - booking[6]))
+            served.append(booking)
+            if lane.bookings:
+                heapreplace(fronts, (lane.view.first(), lane))
+            else:
+                heappop(fronts)
+        if self.journal is not None and served:
+            self.journal.log_removes([booking[1] for booking in served])
+            self._logged()
+        if metrics is not None:
+            metrics.served += len(served)
+            for booking in served:
+                metrics.booking_removed(booking[5])
+            metrics.record("serve_batch", time.perf_counter_ns() - started)
+        return served
+
+    def wait_percentiles(self, percentiles=(50, 90, 99), priority_level=None):
+        """Return {percentile: seconds waited} over the most recently served bookings."""
+        if priority_level is None:
+            waits = sorted(wait for _, wait in self.wait_times)
+        else:
+            priority = self.priority_map[priority_level]
+            waits = sorted(wait for booking_priority, wait in self.wait_times if booking_priority == priority)
+        if not waits:
+            return {}
+        return {percentile: waits[max(ceil(percentile / 100 * len(waits)) - 1, 0)] for percentile in percentiles}
+
+    def find_bookings(self, phone_number):
+        """Return the waiting bookings made with phone_number, in the order they will be served."""
+        counters = self.bookings_by_phone.get(phone_number, ())
+        return sorted(self.lanes[self.waiting[counter]].get(counter) for counter in counters)
+
+    def cancel_booking(self, booking_number):
+        """Remove a waiting booking by its booking counter. Returns the booking, or None if it is not waiting."""
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter_ns()
+        destination = self.waiting.get(booking_number)
+        if destination is None:
+            return None
+        if self.journal is not None:
+            self.journal.log_removes([booking_number])
+        booking = self.lanes[destination].remove(booking_number)
+        self._forget(booking)
+        if self.journal is not None:
+            self._logged()
+        if metrics is not None:
+            metrics.cancelled += 1
+            metrics.booking_removed(booking[5])
+            metrics.record("cancel_booking", time.perf_counter_ns() - started)
+        return booking
+
+    def change_priority(self, booking_number, priority_level):
+        """Move a waiting booking to another priority level in place. Returns the updated booking, or None.
+
+        The booking keeps the credit for the time it has already waited.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter_ns()
+        destination = self.waiting.get(booking_number)
+        if destination is None:
+            return None
+        lane = self.lanes[destination]
+        _, _, phone_number, start, _, old_priority, booked_at = lane.get(booking_number)
+        priority = self.priority_map[priority_level]
+        booking = (self._rank(priority, booked_at), booking_number, phone_number, start, destination, priority, booked_at)
+        if self.journal is not None:
+            self.journal.log_change(booking_number, priority)
+        lane.replace(booking)
+        if self.journal is not None:
+            self._logged()
+        if metrics is not None:
+            metrics.priority_changed(old_priority, priority)
+            metrics.record("change_priority", time.perf_counter_ns() - started)
+        return booking
+
+    def view_bookings(self, destination_filter=None, limit=None):
+        """Return (phone, priority, start, destination) rows in the order the bookings will be served.
+
+        Rows come from each lane's sorted view, merged on the fly when there is no filter, so
+        the first limit rows cost O(limit) to list.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter_ns()
         if destination_filter:
-            filtered_bookings = [
-                (b[2], b[0], b[3], b[4])
-                for b in self.heap
-                if b[4] == destination_filter
-            ]
+            lanes = [self.lanes[destination_filter]] if destination_filter in self.lanes else []
         else:
-            filtered_bookings = [(b[2], b[0], b[3], b[4]) for b in self.heap]
+            lanes = self.lanes.values()
+        rows = [view_row(booking) for booking in islice(merge(*(lane.view for lane in lanes)), limit)]
+        if metrics is not None:
+            metrics.record("view_bookings", time.perf_counter_ns() - started)
+        return rows
 
-        # Sort by priority (with higher values now being lower priority) and booking counter
-        sorted_bookings = sorted(filtered_bookings, key=lambda x: (x[1], x[0]))
-        return sorted_bookings
 
+def load_tkinter():
+    """Import Tkinter the first time the GUI needs it."""
+    global tk, ttk
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk
 
 class RideShareApp:
-    def __init__(self, root):
-        self.system = RideShareHeap()
+    def __init__(self, root, system=None):
+        load_tkinter()
+        self.system = system if system is not None else RideShareHeap()
+        self.priority_names = {priority: name for name, priority in self.system.priority_map.items()}
+        self.view_limit = 500  # Bookings shown in the list, next to be listed first
         self.root = root
         self.root.title("Ride Sharing Taxi Booking System")
         self.root.state("zoomed")  # Maximize the window at startup
@@ -183,8 +768,8 @@ class RideShareApp:
             )
             return
 
-        message = self.system.add_booking(phone, priority, start, destination)
-        self.status_label.config(text=message, fg="green")
+        booking = self.system.add_booking(phone, priority, start, destination)
+        self.status_label.config(text=f"Booking added: {self.describe(booking)}", fg="green")
         self.phone_entry.delete(0, tk.END)
         self.refresh_bookings()
 
@@ -194,9 +779,16 @@ class RideShareApp:
         """
         return phone.isdigit() and len(phone) == 10 and phone[:3] in {"078", "079", "072", "073"}
 
+    def describe(self, booking):
+        _, _, phone_number, start, destination, priority, _ = booking
+        return f"Phone={phone_number}, Priority={self.priority_names[priority]}, Route={start} → {destination}"
+
     def serve_booking(self):
-        message = self.system.serve_booking()
-        self.status_label.config(text=message, fg="green" if "Serving" in message else "red")
+        booking = self.system.serve_booking()
+        if booking is None:
+            self.status_label.config(text="No bookings to serve.", fg="red")
+        else:
+            self.status_label.config(text=f"Serving booking: {self.describe(booking)}", fg="green")
         self.refresh_bookings()
 
     def apply_filter(self):
@@ -210,13 +802,22 @@ class RideShareApp:
         for row in self.tree.get_children():
             self.tree.delete(row)
 
-        bookings = self.system.view_bookings(destination_filter=destination_filter)
+        bookings = self.system.view_bookings(destination_filter=destination_filter, limit=self.view_limit)
         for booking in bookings:
             self.tree.insert("", "end", values=booking)
 
 
 # Main Program
+# The GUI and the booking service age waiting bookings by one priority level a minute, so a run
+# of urgent bookings delays a low-priority one by at most a few minutes. RideShareHeap() alone
+# does not age.
+DEFAULT_AGING_INTERVAL = 60  # Seconds
+
 if __name__ == "__main__":
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "heap_bookings.log")
+    system = RideShareHeap(aging_interval=DEFAULT_AGING_INTERVAL, log_path=path)
+    load_tkinter()
     root = tk.Tk()
-    app = RideShareApp(root)
+    app = RideShareApp(root, system)
     root.mainloop()
+    system.close()
@@ -1,81 +1,598 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
 import random
 import re
+from collections import deque
+import struct
+import mmap
+import os
+import threading
+import time
+from array import array
+
+# Tkinter is imported by load_tkinter() when the GUI starts, so the booking classes can be used without it
+tk = ttk = messagebox = None
 
 # Utility Functions
 def generate_taxi_id(destination):
     """Generate a unique Taxi ID based on the destination."""
     return f"TAXI-{destination[:3].upper()}-{random.randint(1000, 9999)}"
 
+def encode_field(text, size):
+    """Encode text as UTF-8 for a fixed-width log field, refusing text that would not fit whole."""
+    if not isinstance(text, str):
+        raise ValueError(f"{text!r} is not text")
+    data = text.encode()
+    if len(data) > size:
+        raise ValueError(f"{text!r} is longer than {size} bytes")
+    return data
+
+# Booking Log (On-Disk History)
+class BookingLog:
+    """Append-only booking history file, replayed lazily through a memory map and fsync'ed in batches."""
+    RECORD = struct.Struct("<16s16s32sI32sd")  # phone number, taxi ID, destination, fare, start location, booking time
+
+    def __init__(self, path, sync_every=64):
+        self.path = path
+        self.sync_every = sync_every
+        self.pending = 0
+        self.file = open(path, "ab")
+        # Drop a partially written record left behind by a crash
+        self.file.truncate(self.file.tell() - self.file.tell() % self.RECORD.size)
+        self.mapped_count = self.file.tell() // self.RECORD.size
+        self.mapped = None
+        if self.mapped_count:
+            with open(path, "rb") as reader:
+                self.mapped = mmap.mmap(reader.fileno(), self.mapped_count * self.RECORD.size, access=mmap.ACCESS_READ)
+        self.recent = []  # Records appended since the log was opened
+        self.recent_times = []  # Booking times of the recent records
+
+    def _encode(self, record, booked_at):
+        passenger_number, taxi_id, destination, fare, start_location, _ = record
+        if not isinstance(fare, int) or not 0 <= fare <= 0xFFFFFFFF:
+            raise ValueError(f"Fare {fare!r} is not a whole number from 0 to 4294967295")
+        return self.RECORD.pack(encode_field(str(passenger_number), 16), encode_field(taxi_id, 16), encode_field(destination, 32), fare, encode_field(start_location, 32), booked_at)
+
+    def check(self, record):
+        """Raise ValueError if record cannot be stored exactly, so a booking can be refused before its seat is taken."""
+        self._encode(record, 0.0)
+
+    def _decode(self, index):
+        passenger_number, taxi_id, destination, fare, start_location, _ = self.RECORD.unpack_from(self.mapped, index * self.RECORD.size)
+        destination = destination.rstrip(b"\0").decode()
+        return (passenger_number.rstrip(b"\0").decode(), taxi_id.rstrip(b"\0").decode(), destination, fare, start_location.rstrip(b"\0").decode(), destination)
+
+    def __len__(self):
+        return self.mapped_count + len(self.recent)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("booking log index out of range")
+        if index < self.mapped_count:
+            return self._decode(index)
+        return self.recent[index - self.mapped_count]
+
+    def __iter__(self):
+        for index in range(self.mapped_count):
+            yield self._decode(index)
+        yield from self.recent
+
+    def booked_at(self, index):
+        """Return the time.time() at which the record at index was booked."""
+        if index < self.mapped_count:
+            return self.RECORD.unpack_from(self.mapped, index * self.RECORD.size)[5]
+        return self.recent_times[index - self.mapped_count]
+
+    def append(self, record, booked_at=None):
+        """Write a booking record to the end of the log."""
+        if booked_at is None:
+            booked_at = time.time()
+        self.file.write(self._encode(record, booked_at))
+        self.file.flush()
+        self.recent.append(record)
+        self.recent_times.append(booked_at)
+        self.pending += 1
+        if self.pending >= self.sync_every:
+            self.sync()
+
+    def extend(self, records, booked_at=None):
+        """Write many booking records, all booked at the same time, with a single write."""
+        if booked_at is None:
+            booked_at = time.time()
+        self.file.write(b"".join(self._encode(record, booked_at) for record in records))
+        self.file.flush()
+        self.recent.extend(records)
+        self.recent_times.extend([booked_at] * len(records))
+        self.pending += len(records)
+        if self.pending >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """Force every appended record onto disk."""
+        if self.pending:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def clear(self):
+        """Delete every record from the log."""
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+        self.file.truncate(0)
+        self.mapped_count = 0
+        self.recent = []
+        self.recent_times = []
+        self.pending = 1
+        self.sync()
+
+    def close(self):
+        self.sync()
+        if self.mapped is not None:
+            self.mapped.close()
+        self.file.close()
+
+# Columnar Booking History (In-Memory)
+class ColumnarHistory:
+    """In-memory booking history stored column by column, with the text columns dictionary-encoded.
+
+    Each booking costs a few machine integers instead of a tuple, and rows are
+    only rebuilt as tuples when they are read.
+    """
+    def __init__(self):
+        self.strings = []  # Code -> string, shared by all text columns
+        self.codes = {}  # String -> code
+        self.passenger_numbers = array("I")
+        self.taxi_ids = array("I")
+        self.destinations = array("I")
+        self.start_locations = array("I")
+        self.fares = array("q")
+        self.booked_times = array("d")
+
+    def _encode(self, text):
+        code = self.codes.get(text)
+        if code is None:
+            code = self.codes[text] = len(self.strings)
+            self.strings.append(text)
+        return code
+
+    def __len__(self):
+        return len(self.fares)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        strings = self.strings
+        destination = strings[self.destinations[index]]
+        return (strings[self.passenger_numbers[index]], strings[self.taxi_ids[index]], destination, self.fares[index], strings[self.start_locations[index]], destination)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def booked_at(self, index):
+        """Return the time.time() at which the record at index was booked."""
+        return self.booked_times[index]
+
+    def check(self, record):
+        """Raise ValueError if record cannot be stored, so a half-written row never leaves the columns uneven."""
+        passenger_number, taxi_id, destination, fare, start_location, _ = record
+        if not isinstance(fare, int) or not -2 ** 63 <= fare < 2 ** 63:
+            raise ValueError(f"Fare {fare!r} is not a whole number")
+        for text in (passenger_number, taxi_id, destination, start_location):
+            try:
+                hash(text)
+            except TypeError:
+                raise ValueError(f"{text!r} cannot be stored in the booking history") from None
+
+    def append(self, record, booked_at=None):
+        passenger_number, taxi_id, destination, fare, start_location, _ = record
+        self.passenger_numbers.append(self._encode(passenger_number))
+        self.taxi_ids.append(self._encode(taxi_id))
+        self.destinations.append(self._encode(destination))
+        self.fares.append(fare)
+        self.start_locations.append(self._encode(start_location))
+        self.booked_times.append(time.time() if booked_at is None else booked_at)
+
+    def extend(self, records, booked_at=None):
+        if booked_at is None:
+            booked_at = time.time()
+        for record in records:
+            self.append(record, booked_at)
+
 # Car and Passenger Management
 class Passenger:
+    __slots__ = ("passenger_number", "start_location", "destination")
+
     def __init__(self, passenger_number, start_location, destination):
         self.passenger_number = passenger_number
         self.start_location = start_location
         self.destination = destination
 
 class Taxi:
+    __slots__ = ("taxi_id", "location", "fare", "passengers", "capacity", "lock")
+
     def __init__(self, taxi_id, location, fare):
         self.taxi_id = taxi_id
         self.location = location
         self.fare = fare
         self.passengers = []
         self.capacity = 5  # Set the capacity to 5 passengers
+        self.lock = threading.RLock()  # Held while checking and filling this taxi's seats
 
     def assign_passenger(self, passenger):
         """Assign a passenger to the taxi if there is space."""
-        if len(self.passengers) < self.capacity:
-            self.passengers.append(passenger)
-            return True
-        return False
+        with self.lock:
+            if len(self.passengers) < self.capacity:
+                self.passengers.append(passenger)
+                return True
+            return False
 
     def available_slots(self):
         """Returns the available slots in the taxi."""
         return self.capacity - len(self.passengers)
 
-class TaxiBookingSystem:
+class FareMatrix:
+    """Dense table of the fare between every pair of locations.
+
+    Locations are interned to small integer IDs when the table is built, and a fare lookup is
+    a single array index. Routes work in both directions, unless the way back is configured
+    as a route of its own. A configured route always keeps its own fare, and only places
+    without a direct route are priced as the cheapest chain of routes between them.
+    """
+    NO_ROUTE = -1
+
+    def __init__(self, routes):
+        """Build the table from a {(start location, destination): fare} dict."""
+        self.location_ids = {}  # Location name -> ID
+        for route in routes:
+            for location in route:
+                self.location_ids.setdefault(location, len(self.location_ids))
+        n = self.size = len(self.location_ids)
+
+        # Direct routes in both directions, a configured way back overriding the reversed route
+        configured = {(self.location_ids[start], self.location_ids[destination]): fare for (start, destination), fare in routes.items()}
+        direct = {(destination, start): fare for (start, destination), fare in configured.items()}
+        direct.update(configured)  # (start ID, destination ID) -> fare
+        best = [[0 if start == destination else float("inf") for destination in range(n)] for start in range(n)]
+        for (start, destination), fare in direct.items():
+            best[start][destination] = fare
+
+        # Floyd-Warshall for the places without a direct route
+        for via in range(n):
+            for start in range(n):
+                for destination in range(n):
+                    if best[start][via] + best[via][destination] < best[start][destination]:
+                        best[start][destination] = best[start][via] + best[via][destination]
+        for (start, destination), fare in direct.items():
+            best[start][destination] = fare
+
+        self.fares = array("q", (self.NO_ROUTE if fare == float("inf") else fare for row in best for fare in row))
+
+    def fare(self, start_location, destination):
+        """Return the fare from start_location to destination, or None if they are not connected."""
+        start = self.location_ids.get(start_location)
+        end = self.location_ids.get(destination)
+        if start is None or end is None or start == end:
+            return None
+        fare = self.fares[start * self.size + end]
+        return None if fare == self.NO_ROUTE else fare
+
+    def price_routes(self, pairs):
+        """Return the fare, or None, for each (start location, destination) pair."""
+        return [self.fare(start_location, destination) for start_location, destination in pairs]
+
+class HistoryIndex:
+    """Hash indexes on booking history columns, so filtered queries only touch matching records."""
+    COLUMNS = {"passenger_number": 0, "taxi_id": 1, "start_location": 4, "destination": 5}  # Column -> record field
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.positions = {column: {} for column in self.COLUMNS}  # Column -> value -> record positions
+        self.size = 0  # Number of history records indexed so far
+
+    def add(self, record):
+        for column, field in self.COLUMNS.items():
+            self.positions[column].setdefault(record[field], []).append(self.size)
+        self.size += 1
+
+    def catch_up(self, history):
+        """Index the records of history that were not added one by one, such as ones replayed from the log."""
+        for position in range(self.size, len(history)):
+            self.add(history[position])
+
+    def find(self, history, filters):
+        """Return the positions of records matching every column=value filter, in booking order."""
+        self.catch_up(history)
+        postings = sorted((self.positions[column].get(value, []) for column, value in filters.items()), key=len)
+        if len(postings) == 1:
+            return postings[0]
+        # Compound filter: walk the shortest posting list and check the remaining columns
+        checks = [(self.COLUMNS[column], value) for column, value in filters.items()]
+        return [position for position in postings[0] if all(history[position][field] == value for field, value in checks)]
+
+class BookingStats:
+    """Running totals over the booking history, so end-of-day reports never rescan the bookings."""
     def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.revenue_by_route = {}  # (start location, destination) -> total fares
+        self.bookings_by_taxi = {}  # Taxi ID -> number of bookings
+        self.bookings_by_hour = [0] * 24  # Hour of the day -> number of bookings
+        self.size = 0  # Number of history records counted so far
+
+    def add(self, record, booked_at):
+        _, taxi_id, destination, fare, start_location, _ = record
+        route = (start_location, destination)
+        self.revenue_by_route[route] = self.revenue_by_route.get(route, 0) + fare
+        self.bookings_by_taxi[taxi_id] = self.bookings_by_taxi.get(taxi_id, 0) + 1
+        self.bookings_by_hour[time.localtime(booked_at).tm_hour] += 1
+        self.size += 1
+
+    def extend(self, records, booked_at):
+        """Count records that were all booked at booked_at, looking up its hour once."""
+        revenue_by_route, bookings_by_taxi = self.revenue_by_route, self.bookings_by_taxi
+        for _, taxi_id, destination, fare, start_location, _ in records:
+            route = (start_location, destination)
+            revenue_by_route[route] = revenue_by_route.get(route, 0) + fare
+            bookings_by_taxi[taxi_id] = bookings_by_taxi.get(taxi_id, 0) + 1
+        self.bookings_by_hour[time.localtime(booked_at).tm_hour] += len(records)
+        self.size += len(records)
+
+    def catch_up(self, history):
+        """Count the records of history that were not added one by one, such as ones replayed from the log."""
+        for position in range(self.size, len(history)):
+            self.add(history[position], history.booked_at(position))
+
+class TaxiBookingSystem:
+    def __init__(self, log_path=None):
         self.taxis = []
-        self.booking_history = []
+        self.open_taxis = {}  # Destination -> queue of its taxis that still have free seats
+        # Store booking history, on disk when a log file is given
+        self.booking_history = BookingLog(log_path) if log_path else ColumnarHistory()
+        self.history_index = HistoryIndex()  # Built on the first filtered query, then kept up to date
+        self.booking_stats = BookingStats()  # Built on the first report, then kept up to date
+        # (start location, destination) -> fare, since location names may themselves contain "-"
         self.routes = {
-            "Kigali-Huye": 3900,
-            "Kigali-Musanze": 3500,
-            "Kigali-Nyagatare": 4000,
-            "Kigali-Rusizi": 9000
+            ("Kigali", "Huye"): 3900,
+            ("Kigali", "Musanze"): 3500,
+            ("Kigali", "Nyagatare"): 4000,
+            ("Kigali", "Rusizi"): 9000
         }
+        self.fare_matrix = FareMatrix(self.routes)
+        # Guards the taxi queues, history, index and stats. Seats are guarded by each taxi's own
+        # lock, so bookings on different taxis only contend here briefly. Always take a taxi's
+        # lock before this one, never the other way round.
+        self.lock = threading.RLock()
+
+    def add_route(self, start_location, destination, fare):
+        """Add or reprice a route and rebuild the fare table. Nothing changes if the table cannot be built."""
+        with self.lock:
+            routes = dict(self.routes)
+            routes[(start_location, destination)] = fare
+            fare_matrix = FareMatrix(routes)
+            self.routes, self.fare_matrix = routes, fare_matrix
+
+    def price_routes(self, pairs):
+        """Price many (start location, destination) pairs at once."""
+        return self.fare_matrix.price_routes(pairs)
 
     def add_taxi(self, destination, fare):
         taxi_id = generate_taxi_id(destination)
+        # Booking records are checked without their taxi, so check the Taxi ID here
+        self.booking_history.check(("", taxi_id, destination, 0, "", destination))
         taxi = Taxi(taxi_id, destination, fare)
-        self.taxis.append(taxi)
+        with self.lock:
+            self.taxis.append(taxi)
+            self.open_taxis.setdefault(destination, deque()).append(taxi)
 
     def request_ride(self, passenger_number, start_location, destination):
         passenger = Passenger(passenger_number, start_location, destination)
 
-        route_key = f"{start_location}-{destination}"
-        if route_key not in self.routes:
+        fare = self.fare_matrix.fare(start_location, destination)
+        if fare is None:
             return None, "Invalid route selected", None
-
-        fare = self.routes[route_key]
-        for taxi in self.taxis:
-            if taxi.location == destination and taxi.assign_passenger(passenger):
-                self.booking_history.append((passenger_number, taxi.taxi_id, destination, fare, start_location, destination))
-                return taxi.taxi_id, destination, fare
-
-        return None, "No available taxis", None
-
-    def get_booking_history(self, destination_filter=None):
-        if destination_filter:
-            return [record for record in self.booking_history if record[5] == destination_filter]
-        return self.booking_history
+        self.booking_history.check((passenger_number, "", destination, fare, start_location, destination))
+
+        taxi = self._take_seat(passenger, destination)
+        if taxi is None:
+            return None, "No available taxis", None
+        self._log_bookings([(passenger_number, taxi.taxi_id, destination, fare, start_location, destination)])
+        return taxi.taxi_id, destination, fare
+
+    def _take_seat(self, passenger, destination):
+        """Seat passenger on the first taxi in line for destination and return it, or None if none is open."""
+        while True:
+            # Only taxis with free seats are queued, so the first one in line can normally take the passenger
+            with self.lock:
+                open_taxis = self.open_taxis.get(destination)
+                if not open_taxis:
+                    return None
+                taxi = open_taxis[0]
+            with taxi.lock:
+                if not taxi.assign_passenger(passenger):
+                    continue  # Another thread took the last seat and already moved on to the next taxi
+                if taxi.available_slots() == 0:
+                    # Whoever takes the last seat dequeues the taxi, while still holding its lock
+                    with self.lock:
+                        open_taxis.popleft()
+                return taxi
+
+    def request_rides_batch(self, requests):
+        """Book many (passenger number, start location, destination) requests in one pass.
+
+        Every request is priced and checked before any seat is taken, so a malformed request
+        raises without booking anything. Requests are then grouped by destination and seated
+        from that destination's open taxis, and the history gets a single append. Returns the
+        request_ride result of each request, in the same order.
+        """
+        results = [None] * len(requests)
+        fares = [None] * len(requests)
+        positions_by_destination = {}
+        for position, (passenger_number, start_location, destination) in enumerate(requests):
+            fare = fares[position] = self.fare_matrix.fare(start_location, destination)
+            if fare is None:
+                results[position] = (None, "Invalid route selected", None)
+                continue
+            self.booking_history.check((passenger_number, "", destination, fare, start_location, destination))
+            positions_by_destination.setdefault(destination, []).append(position)
+
+        for destination, positions in positions_by_destination.items():
+            for position in positions:
+                passenger_number, start_location, _ = requests[position]
+                fare = fares[position]
+                taxi = self._take_seat(Passenger(passenger_number, start_location, destination), destination)
+                if taxi is None:
+                    results[position] = (None, "No available taxis", None)
+                    continue
+                results[position] = (taxi.taxi_id, destination, fare)
+
+        # Log the bookings in request order
+        records = [(request[0], taxi_id, destination, fare, request[1], destination) for request, (taxi_id, destination, fare) in zip(requests, results) if taxi_id]
+        if records:
+            self._log_bookings(records)
+        return results
+
+    def _log_bookings(self, records):
+        """Append records to the history, and to the index and stats if they are caught up."""
+        booked_at = time.time()
+        with self.lock:
+            first_position = len(self.booking_history)
+            self.booking_history.extend(records, booked_at)
+            if self.history_index.size == first_position:
+                for record in records:
+                    self.history_index.add(record)
+            if self.booking_stats.size == first_position:
+                self.booking_stats.extend(records, booked_at)
+
+    def _history_filters(self, destination_filter, passenger_number, taxi_id, start_location):
+        filters = {"destination": destination_filter, "passenger_number": passenger_number, "taxi_id": taxi_id, "start_location": start_location}
+        return {column: value for column, value in filters.items() if value}
+
+    def get_booking_history(self, destination_filter=None, offset=0, limit=None, passenger_number=None, taxi_id=None, start_location=None):
+        """Return booking records, optionally filtered and cut to one page of limit records from offset."""
+        end = None if limit is None else offset + limit
+        filters = self._history_filters(destination_filter, passenger_number, taxi_id, start_location)
+        with self.lock:
+            if filters:
+                positions = self.history_index.find(self.booking_history, filters)
+                return [self.booking_history[position] for position in positions[offset:end]]
+            if limit is None and not offset:
+                return self.booking_history
+            return self.booking_history[offset:end]
+
+    def count_booking_history(self, destination_filter=None, passenger_number=None, taxi_id=None, start_location=None):
+        """Return the number of booking records matching the filters."""
+        filters = self._history_filters(destination_filter, passenger_number, taxi_id, start_location)
+        with self.lock:
+            if filters:
+                return len(self.history_index.find(self.booking_history, filters))
+            return len(self.booking_history)
 
     def clear_booking_history(self):
-        self.booking_history = []
+        with self.lock:
+            if isinstance(self.booking_history, BookingLog):
+                self.booking_history.clear()
+            else:
+                self.booking_history = ColumnarHistory()
+            self.history_index.clear()
+            self.booking_stats.clear()
+
+    def revenue_by_route(self):
+        """Return the total fares booked on each (start location, destination) route."""
+        with self.lock:
+            self.booking_stats.catch_up(self.booking_history)
+            return dict(self.booking_stats.revenue_by_route)
+
+    def bookings_by_taxi(self):
+        """Return the number of bookings made on each taxi."""
+        with self.lock:
+            self.booking_stats.catch_up(self.booking_history)
+            return dict(self.booking_stats.bookings_by_taxi)
+
+    def bookings_by_hour(self):
+        """Return a 24-entry histogram of bookings by hour of the day."""
+        with self.lock:
+            self.booking_stats.catch_up(self.booking_history)
+            return list(self.booking_stats.bookings_by_hour)
 
 # Tkinter GUI Implementation
+def load_tkinter():
+    """Import Tkinter the first time the GUI needs it."""
+    global tk, ttk, messagebox
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk, messagebox
+
+class VirtualHistoryView:
+    """Show a fixed window of booking history rows in a Treeview, fetching pages as it scrolls."""
+    def __init__(self, tree, scrollbar, fetch_page, count_rows):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch_page = fetch_page  # fetch_page(offset, limit) -> list of rows
+        self.count_rows = count_rows  # count_rows() -> total number of rows
+        self.offset = 0
+        self.page_size = int(tree.cget("height"))
+
+        self.scrollbar.config(command=self.on_scroll)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-1))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(1))
+
+    def on_scroll(self, action, amount, unit=None):
+        """Handle the scrollbar's moveto/scroll commands."""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.count_rows()))
+        else:
+            step = self.page_size if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll_by(-1 if event.delta > 0 else 1)
+        return "break"
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset):
+        """Move the window so it starts at offset, clamped to the available rows."""
+        total = self.count_rows()
+        self.offset = max(0, min(offset, total - self.page_size))
+        self.render(total)
+
+    def row_appended(self):
+        """Follow the newest rows if the end was in view, otherwise only move the scrollbar."""
+        total = self.count_rows()
+        if self.offset + self.page_size >= total - 1:
+            self.scroll_to(total)
+        else:
+            self.render(total)
+
+    def render(self, total=None):
+        """Reuse the existing Treeview rows for the current page instead of recreating them."""
+        if total is None:
+            total = self.count_rows()
+        rows = self.fetch_page(self.offset, self.page_size)
+        items = self.tree.get_children()
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=values)
+        for item in items[len(rows):]:
+            self.tree.delete(item)
+        for values in rows[len(items):]:
+            self.tree.insert("", "end", values=values)
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(rows)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
 class TaxiBookingApp:
     def __init__(self, root, system):
+        load_tkinter()
         self.root = root
         self.system = system
 
@@ -132,11 +649,21 @@ class TaxiBookingApp:
         clear_history_button = tk.Button(history_frame, text="Clear History", command=self.clear_history, width=15, bg="#dc3545", fg="white", font=("Helvetica", 12))
         clear_history_button.grid(row=1, column=2, padx=5, pady=5)
 
-        # History Table
-        self.history_tree = ttk.Treeview(history_frame, columns=("Phone", "Taxi ID", "Destination", "Fare", "Start", "End"), show="headings")
+        # History Table, showing one page of the history at a time
+        self.history_tree = ttk.Treeview(history_frame, columns=("Phone", "Taxi ID", "Destination", "Fare", "Start", "End"), show="headings", height=20)
         for col in ["Phone", "Taxi ID", "Destination", "Fare", "Start", "End"]:
             self.history_tree.heading(col, text=col)
         self.history_tree.grid(row=2, column=0, columnspan=3, padx=5, pady=5, sticky="nsew")
+        history_scrollbar = tk.Scrollbar(history_frame, orient="vertical")
+        history_scrollbar.grid(row=2, column=3, pady=5, sticky="ns")
+
+        self.history_filter = None
+        self.history_view = VirtualHistoryView(
+            self.history_tree,
+            history_scrollbar,
+            lambda offset, limit: self.system.get_booking_history(self.history_filter, offset, limit),
+            lambda: self.system.count_booking_history(self.history_filter),
+        )
 
         # Make history_tree expandable
         history_frame.rowconfigure(2, weight=1)
@@ -174,30 +701,18 @@ class TaxiBookingApp:
             self.refresh_history()
 
     def refresh_history(self):
-        for row in self.history_tree.get_children():
-            self.history_tree.delete(row)
-
-        for record in self.system.get_booking_history():
-            self.history_tree.insert("", tk.END, values=record)
+        self.history_view.row_appended()
 
     def filter_history(self):
         filter_value = self.filter_combobox.get()
-        if filter_value == "All":
-            filtered = self.system.get_booking_history()
-        else:
-            filtered = self.system.get_booking_history(destination_filter=filter_value)
-
-        for row in self.history_tree.get_children():
-            self.history_tree.delete(row)
-
-        for record in filtered:
-            self.history_tree.insert("", tk.END, values=record)
+        self.history_filter = None if filter_value == "All" else filter_value
+        self.history_view.scroll_to(0)
 
     def clear_history(self):
         result = messagebox.askyesno("Clear History", "Are you sure you want to clear all booking history? This action cannot be undone.")
         if result:
             self.system.clear_booking_history()
-            self.refresh_history()
+            self.history_view.scroll_to(0)
 
     def on_close(self):
         result = messagebox.askyesno("Exit", "Are you sure you want to exit?")
@@ -205,8 +720,9 @@ class TaxiBookingApp:
             self.root.destroy()
 
 if __name__ == "__main__":
+    load_tkinter()
     root = tk.Tk()
-    system = TaxiBookingSystem()
+    system = TaxiBookingSystem(os.path.join(os.path.dirname(os.path.abspath(__file__)), "array_bookings.log"))
     system.add_taxi("Huye", 3900)
     system.add_taxi("Musanze", 3500)
     system.add_taxi("Nyagatare", 4000)
@@ -218,3 +734,4 @@ if __name__ == "__main__":
     
     root.state("zoomed")
     root.mainloop()
+    system.booking_history.close()
@@ -1,7 +1,15 @@
-import tkinter as tk
-from tkinter import ttk
 import random
 import string
+import struct
+import csv
+import json
+import gc
+import mmap
+import os
+import threading
+
+# Tkinter is imported by load_tkinter() when the GUI starts, so the booking classes can be used without it
+tk = ttk = None
 
 # ==============================
 # Utility Functions
@@ -10,27 +18,364 @@ def generate_taxi_id():
     """Generate a random alphanumeric Taxi ID with up to 5 characters."""
     return ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
 
+def generate_taxi_ids(count, existing=()):
+    """Generate count distinct random Taxi IDs in one batch, skipping any already in existing."""
+    taxi_ids = set()
+    while len(taxi_ids) < count:
+        # Draw all the missing IDs at once and redraw only the ones that collided
+        chars = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5 * (count - len(taxi_ids))))
+        for i in range(0, len(chars), 5):
+            taxi_id = chars[i:i + 5]
+            if taxi_id not in existing:
+                taxi_ids.add(taxi_id)
+    return list(taxi_ids)
+
+def fleet_row(location, fare):
+    """Return a (location, fare) row with a whole, non-negative fare, or raise ValueError."""
+    if isinstance(fare, str):
+        fare = int(fare.strip())
+    elif isinstance(fare, float) and fare.is_integer():
+        fare = int(fare)
+    if isinstance(fare, bool) or not isinstance(fare, int) or fare < 0:
+        raise ValueError(f"Fare {fare!r} is not a whole number of francs")
+    if not isinstance(location, str) or not location:
+        raise ValueError(f"Location {location!r} is not a place name")
+    return location, fare
+
+def read_fleet_file(path):
+    """Read (location, fare) rows from a CSV file with location,fare columns or a JSON list."""
+    with open(path, newline="") as fleet_file:
+        if path.lower().endswith(".json"):
+            records = json.load(fleet_file)
+            return [fleet_row(record["location"], record["fare"]) if isinstance(record, dict) else fleet_row(*record) for record in records]
+        return [fleet_row(row["location"], row["fare"]) for row in csv.DictReader(fleet_file)]
+
+def encode_field(text, size):
+    """Encode text as UTF-8 for a fixed-width log field, refusing text that would not fit whole."""
+    if not isinstance(text, str):
+        raise ValueError(f"{text!r} is not text")
+    data = text.encode()
+    if len(data) > size:
+        raise ValueError(f"{text!r} is longer than {size} bytes")
+    return data
+
+# ==============================
+# AVL Tree (Ordered Index)
+# ==============================
+class AVLNode:
+    __slots__ = ("key", "value", "left", "right", "height")
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+
+class AVLTree:
+    """Self-balancing binary search tree that keeps its keys in sorted order."""
+    def __init__(self):
+        self.root = None
+        self.size = 0
+        self.left_rotations = 0  # Rotation counters, useful when profiling
+        self.right_rotations = 0
+
+    @classmethod
+    def from_sorted(cls, items):
+        """Build a balanced tree in O(n) from (key, value) pairs sorted by unique key."""
+        def build(low, high):
+            if low >= high:
+                return None
+            middle = (low + high) // 2
+            node = AVLNode(*items[middle])
+            node.left = build(low, middle)
+            node.right = build(middle + 1, high)
+            node.height = 1 + max(cls._height(node.left), cls._height(node.right))
+            return node
+
+        tree = cls()
+        tree.root = build(0, len(items))
+        tree.size = len(items)
+        return tree
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    @staticmethod
+    def _height(node):
+        return node.height if node else 0
+
+    def _update_height(self, node):
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+
+    def _balance_factor(self, node):
+        return self._height(node.left) - self._height(node.right)
+
+    def _rotate_left(self, node):
+        """Rotate the subtree left and return its new root."""
+        self.left_rotations += 1
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        """Rotate the subtree right and return its new root."""
+        self.right_rotations += 1
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        """Restore the AVL property at this node after an insert or delete."""
+        self._update_height(node)
+        balance = self._balance_factor(node)
+        if balance > 1:
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _find(self, key):
+        node = self.root
+        while node:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def get(self, key, default=None):
+        """Return the value stored under key, or default if it is missing."""
+        node = self._find(key)
+        return node.value if node else default
+
+    def insert(self, key, value):
+        """Insert key with value, replacing the value if the key already exists."""
+        self.root = self._insert(self.root, key, value)
+
+    def _insert(self, node, key, value):
+        if node is None:
+            self.size += 1
+            return AVLNode(key, value)
+        if key < node.key:
+            node.left = self._insert(node.left, key, value)
+        elif key > node.key:
+            node.right = self._insert(node.right, key, value)
+        else:
+            node.value = value
+            return node
+        return self._rebalance(node)
+
+    def delete(self, key):
+        """Remove key from the tree. Returns True if the key was present."""
+        size_before = self.size
+        self.root = self._delete(self.root, key)
+        return self.size < size_before
+
+    def _delete(self, node, key):
+        if node is None:
+            return None
+        if key < node.key:
+            node.left = self._delete(node.left, key)
+        elif key > node.key:
+            node.right = self._delete(node.right, key)
+        else:
+            if node.left is None or node.right is None:
+                self.size -= 1
+                return node.left or node.right
+            # Two children: take over the in-order successor and delete it instead
+            successor = node.right
+            while successor.left:
+                successor = successor.left
+            node.key, node.value = successor.key, successor.value
+            node.right = self._delete(node.right, successor.key)
+        return self._rebalance(node)
+
+    def successor(self, key):
+        """Return the (key, value) pair with the smallest key greater than key, or None."""
+        node = self.root
+        best = None
+        while node:
+            if key < node.key:
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        return (best.key, best.value) if best else None
+
+    def range(self, low=None, high=None):
+        """Yield (key, value) pairs with low <= key <= high in sorted order."""
+        stack = []
+        node = self.root
+        while stack or node:
+            if node:
+                if low is not None and node.key < low:
+                    node = node.right  # Whole left subtree is below the range
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                if high is not None and node.key > high:
+                    return
+                yield node.key, node.value
+                node = node.right
+
+    def items(self):
+        """Yield every (key, value) pair in sorted order."""
+        return self.range()
+
+    def values(self):
+        """Yield every value in key order."""
+        for _, value in self.items():
+            yield value
+
+# ==============================
+# Booking Log (On-Disk History)
+# ==============================
+class BookingLog:
+    """Append-only file of fixed-width booking records that also serves as the booking history.
+
+    Records already on disk are read straight from a memory map when they are accessed,
+    so opening a log of any size is instant. Writes are flushed on every append and
+    fsync'ed once every sync_every records.
+    """
+    RECORD = struct.Struct("<16s16s32sI")  # phone number, taxi ID, location, fare
+
+    def __init__(self, path, sync_every=64):
+        self.path = path
+        self.sync_every = sync_every
+        self.pending = 0
+        self.file = open(path, "ab")
+        # Drop a partially written record left behind by a crash
+        self.file.truncate(self.file.tell() - self.file.tell() % self.RECORD.size)
+        self.mapped_count = self.file.tell() // self.RECORD.size
+        self.mapped = None
+        if self.mapped_count:
+            with open(path, "rb") as reader:
+                self.mapped = mmap.mmap(reader.fileno(), self.mapped_count * self.RECORD.size, access=mmap.ACCESS_READ)
+        self.recent = []  # Records appended since the log was opened
+
+    def _encode(self, record):
+        passenger_number, taxi_id, location, fare = record
+        if not isinstance(fare, int) or not 0 <= fare <= 0xFFFFFFFF:
+            raise ValueError(f"Fare {fare!r} is not a whole number from 0 to 4294967295")
+        return self.RECORD.pack(encode_field(str(passenger_number), 16), encode_field(taxi_id, 16), encode_field(location, 32), fare)
+
+    def check(self, record):
+        """Raise ValueError if record cannot be stored exactly, so a booking can be refused before its seat is taken."""
+        self._encode(record)
+
+    def _decode(self, index):
+        passenger_number, taxi_id, location, fare = self.RECORD.unpack_from(self.mapped, index * self.RECORD.size)
+        return (passenger_number.rstrip(b"\0").decode(), taxi_id.rstrip(b"\0").decode(), location.rstrip(b"\0").decode(), fare)
+
+    def __len__(self):
+        return self.mapped_count + len(self.recent)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("booking log index out of range")
+        if index < self.mapped_count:
+            return self._decode(index)
+        return self.recent[index - self.mapped_count]
+
+    def __iter__(self):
+        for index in range(self.mapped_count):
+            yield self._decode(index)
+        yield from self.recent
+
+    def append(self, record):
+        """Write a booking record to the end of the log."""
+        self.file.write(self._encode(record))
+        self.file.flush()
+        self.recent.append(record)
+        self.pending += 1
+        if self.pending >= self.sync_every:
+            self.sync()
+
+    def extend(self, records):
+        """Write many booking records to the end of the log with a single write."""
+        self.file.write(b"".join(self._encode(record) for record in records))
+        self.file.flush()
+        self.recent.extend(records)
+        self.pending += len(records)
+        if self.pending >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """Force every appended record onto disk."""
+        if self.pending:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def clear(self):
+        """Delete every record from the log."""
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+        self.file.truncate(0)
+        self.mapped_count = 0
+        self.recent = []
+        self.pending = 1
+        self.sync()
+
+    def close(self):
+        self.sync()
+        if self.mapped is not None:
+            self.mapped.close()
+        self.file.close()
+
 # ==============================
 # Car and Passenger Management
 # ==============================
 class Passenger:
+    __slots__ = ("passenger_number",)
+
     def __init__(self, passenger_number):
         self.passenger_number = passenger_number
 
 class Taxi:
+    __slots__ = ("taxi_id", "location", "fare", "passengers", "capacity", "lock")
+
     def __init__(self, taxi_id, location, fare):
         self.taxi_id = taxi_id
         self.location = location
         self.fare = fare
         self.passengers = []
         self.capacity = 28  # Each taxi has a capacity of 28 passengers
+        self.lock = threading.RLock()  # Held while checking and filling this taxi's seats
 
     def assign_passenger(self, passenger):
         """Assign a passenger to this taxi if space is available."""
-        if len(self.passengers) < self.capacity:
-            self.passengers.append(passenger)
-            return True
-        return False
+        with self.lock:
+            if len(self.passengers) < self.capacity:
+                self.passengers.append(passenger)
+                return True
+            return False
 
     def available_slots(self):
         """Return the number of available slots for passengers."""
@@ -40,49 +385,374 @@ class Taxi:
         """Check if the taxi is full."""
         return len(self.passengers) == self.capacity
 
-class TaxiBookingSystem:
+class SeatIndex:
+    """Buckets the taxis of each route by free seats, so a non-full taxi is found without scanning."""
     def __init__(self):
-        self.taxis = []
-        self.booking_history = []  # Store booking history
+        self.routes = {}  # Location -> {free seats: {Taxi ID: Taxi}}, full taxis and empty buckets left out
+
+    def add(self, taxi, free_seats=None):
+        if free_seats is None:
+            free_seats = taxi.available_slots()
+        if free_seats > 0:
+            self.routes.setdefault(taxi.location, {}).setdefault(free_seats, {})[taxi.taxi_id] = taxi
+
+    def remove(self, taxi, free_seats=None):
+        if free_seats is None:
+            free_seats = taxi.available_slots()
+        buckets = self.routes.get(taxi.location)
+        if not buckets or free_seats not in buckets:
+            return
+        bucket = buckets[free_seats]
+        bucket.pop(taxi.taxi_id, None)
+        if not bucket:
+            del buckets[free_seats]
+            if not buckets:
+                del self.routes[taxi.location]
+
+    def update(self, taxi, old_free_seats):
+        """Move a taxi to the bucket for its current free seats after passengers came or went."""
+        self.remove(taxi, old_free_seats)
+        self.add(taxi)
+
+    def find(self, location, fullest_first=True):
+        """Return a non-full taxi on a route, the fullest or the emptiest one, or None.
+
+        There is one bucket per free-seat count, so this looks at no more than capacity buckets.
+        """
+        buckets = self.routes.get(location)
+        if not buckets:
+            return None
+        free_seats = min(buckets) if fullest_first else max(buckets)
+        return next(iter(buckets[free_seats].values()))
+
+class TaxiBookingSystem:
+    def __init__(self, log_path=None):
+        self.taxis = AVLTree()  # Taxi ID -> Taxi, kept in Taxi ID order
+        self.taxi_index = {}  # Taxi ID -> Taxi, hash lookup for bookings
+        self.fare_index = AVLTree()  # Fare -> {Taxi ID: Taxi}
+        self.route_fare_index = {}  # Location -> AVLTree of Fare -> {Taxi ID: Taxi}
+        self.seat_index = SeatIndex()  # Non-full taxis of each route bucketed by free seats
+        # Store booking history, on disk when a log file is given
+        self.booking_history = BookingLog(log_path) if log_path else []
+        self.listeners = []  # Callbacks notified of every change to taxis or history
+        # Guards the shared indexes and history. Seats are guarded by each taxi's own lock,
+        # so bookings for different taxis only contend here briefly. Always take a taxi's
+        # lock before this one, never the other way round.
+        self.lock = threading.RLock()
+
+    def subscribe(self, listener):
+        """Register a callback(event, table, key, row) for insert/update/delete events."""
+        self.listeners.append(listener)
+
+    def _notify(self, event, table, key, row=None):
+        for listener in self.listeners:
+            listener(event, table, key, row)
 
     def add_taxi(self, location, fare):
         """Add a new taxi with a random Taxi ID to the system."""
-        taxi_id = generate_taxi_id()
-        taxi = Taxi(taxi_id, location, fare)
-        self.taxis.append(taxi)
+        with self.lock:
+            taxi_id = generate_taxi_id()
+            while taxi_id in self.taxi_index:  # Random IDs can collide, draw a new one
+                taxi_id = generate_taxi_id()
+            taxi = Taxi(taxi_id, location, fare)
+            self.taxis.insert(taxi_id, taxi)
+            self.taxi_index[taxi_id] = taxi
+            self._add_to_fare_index(self.fare_index, taxi)
+            if location not in self.route_fare_index:
+                self.route_fare_index[location] = AVLTree()
+            self._add_to_fare_index(self.route_fare_index[location], taxi)
+            self.seat_index.add(taxi)
+            self._notify("insert", "taxis", taxi_id, self._taxi_row(taxi))
+            return taxi_id
+
+    def add_taxis(self, locations_with_fares):
+        """Add many taxis at once, building the indexes a single time at the end."""
+        rows = list(locations_with_fares)
+        # The garbage collector would repeatedly rescan the objects created here, so pause it
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with self.lock:
+                taxi_ids = generate_taxi_ids(len(rows), self.taxi_index)
+                for taxi_id, (location, fare) in zip(taxi_ids, rows):
+                    self.taxi_index[taxi_id] = Taxi(taxi_id, location, fare)
+                self._rebuild_indexes()
+                self._notify("reload", "taxis", None)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return taxi_ids
+
+    def load_fleet(self, path):
+        """Import a fleet from a CSV or JSON file of taxi locations and fares."""
+        return self.add_taxis(read_fleet_file(path))
+
+    def _rebuild_indexes(self):
+        """Rebuild the ordered indexes from taxi_index in one pass."""
+        taxis = sorted(self.taxi_index.values(), key=lambda taxi: taxi.taxi_id)
+        self.taxis = AVLTree.from_sorted([(taxi.taxi_id, taxi) for taxi in taxis])
+
+        fare_buckets = {}
+        route_buckets = {}
+        for taxi in taxis:
+            fare_buckets.setdefault(taxi.fare, {})[taxi.taxi_id] = taxi
+            route_buckets.setdefault(taxi.location, {}).setdefault(taxi.fare, {})[taxi.taxi_id] = taxi
+        self.fare_index = AVLTree.from_sorted(sorted(fare_buckets.items()))
+        self.route_fare_index = {location: AVLTree.from_sorted(sorted(buckets.items())) for location, buckets in route_buckets.items()}
+
+        self.seat_index = SeatIndex()
+        for taxi in taxis:
+            self.seat_index.add(taxi)
+
+    def remove_taxi(self, taxi_id):
+        """Retire a taxi from the system. Returns True if the taxi was found."""
+        taxi = self.get_taxi(taxi_id)
+        if taxi is None:
+            return False
+        with taxi.lock, self.lock:
+            if self.taxi_index.pop(taxi_id, None) is None:  # Another thread retired it first
+                return False
+            self.taxis.delete(taxi_id)
+            self.seat_index.remove(taxi)
+            self._remove_from_fare_index(self.fare_index, taxi)
+            route_tree = self.route_fare_index[taxi.location]
+            self._remove_from_fare_index(route_tree, taxi)
+            if not route_tree:
+                del self.route_fare_index[taxi.location]
+            self._notify("delete", "taxis", taxi_id)
+            return True
+
+    def _add_to_fare_index(self, tree, taxi):
+        bucket = tree.get(taxi.fare)
+        if bucket is None:
+            bucket = {}
+            tree.insert(taxi.fare, bucket)
+        bucket[taxi.taxi_id] = taxi
+
+    def _remove_from_fare_index(self, tree, taxi):
+        bucket = tree.get(taxi.fare)
+        del bucket[taxi.taxi_id]
+        if not bucket:
+            tree.delete(taxi.fare)
+
+    def get_taxi(self, taxi_id):
+        """Look up a taxi by its Taxi ID, or None if it does not exist."""
+        return self.taxi_index.get(taxi_id)
+
+    def taxis_in_fare_range(self, low_fare, high_fare):
+        """Return the taxis whose fare lies between low_fare and high_fare, cheapest first."""
+        with self.lock:
+            return [taxi for _, bucket in self.fare_index.range(low_fare, high_fare) for taxi in bucket.values()]
+
+    def next_taxi_after(self, taxi_id):
+        """Return the taxi with the next Taxi ID in sorted order, or None."""
+        with self.lock:
+            item = self.taxis.successor(taxi_id)
+        return item[1] if item else None
+
+    def cheapest_taxis(self, location, k):
+        """Return up to k of the cheapest taxis serving a route."""
+        result = []
+        with self.lock:
+            route_tree = self.route_fare_index.get(location)
+            if route_tree is None:
+                return result
+            for _, bucket in route_tree.items():
+                for taxi in bucket.values():
+                    if len(result) == k:
+                        return result
+                    result.append(taxi)
+        return result
 
     def request_ride(self, passenger_number, taxi_id):
         """Request a ride for a passenger based on chosen Taxi ID."""
-        passenger = Passenger(passenger_number)
+        taxi = self.get_taxi(taxi_id)
+        if taxi is None:
+            return None, None, None
 
-        for taxi in self.taxis:
-            if taxi.taxi_id == taxi_id:
-                if not taxi.is_full():
-                    if taxi.assign_passenger(passenger):
-                        # Log the booking history
-                        self.booking_history.append((passenger_number, taxi_id, taxi.location, taxi.fare))
-                        return taxi.taxi_id, taxi.location, taxi.fare  # Return taxi ID, location, and fare
-                else:
-                    return taxi.taxi_id, "Taxi is full", None
-        return None, None, None
+        passenger = Passenger(passenger_number)
+        # Check and take the seat under the taxi's lock, so concurrent requests cannot overbook it
+        with taxi.lock:
+            if self.get_taxi(taxi_id) is not taxi:  # Retired by another thread meanwhile
+                return None, None, None
+            if taxi.is_full():
+                return taxi.taxi_id, "Taxi is full", None
+            record = (passenger_number, taxi_id, taxi.location, taxi.fare)
+            self._check_record(record)
+            free_seats = taxi.available_slots()
+            taxi.assign_passenger(passenger)
+            with self.lock:
+                self.seat_index.update(taxi, free_seats)
+                # Log the booking history
+                self.booking_history.append(record)
+                self._notify("update", "taxis", taxi_id, self._taxi_row(taxi))
+                self._notify("insert", "history", len(self.booking_history) - 1, record)
+        return taxi.taxi_id, taxi.location, taxi.fare  # Return taxi ID, location, and fare
+
+    def _check_record(self, record):
+        """Raise ValueError if the booking history cannot store record, before anything is booked."""
+        if isinstance(self.booking_history, BookingLog):
+            self.booking_history.check(record)
+
+    def request_rides_batch(self, requests):
+        """Book many (passenger number, Taxi ID) requests in one pass.
+
+        Every request is checked before any seat is taken, so a malformed request raises
+        without booking anything. Requests are grouped by taxi, so each taxi's indexes and
+        GUI row are updated once, and the history gets a single append. Returns the
+        request_ride result of each request, in the same order.
+        """
+        results = [None] * len(requests)
+        positions_by_taxi = {}
+        for position, (passenger_number, taxi_id) in enumerate(requests):
+            taxi = self.get_taxi(taxi_id)
+            if taxi is not None:
+                self._check_record((passenger_number, taxi_id, taxi.location, taxi.fare))
+            positions_by_taxi.setdefault(taxi_id, []).append(position)
+
+        for taxi_id, positions in positions_by_taxi.items():
+            taxi = self.get_taxi(taxi_id)
+            if taxi is None:
+                for position in positions:
+                    results[position] = (None, None, None)
+                continue
+            with taxi.lock:
+                if self.get_taxi(taxi_id) is not taxi:  # Retired by another thread meanwhile
+                    for position in positions:
+                        results[position] = (None, None, None)
+                    continue
+                free_seats = taxi.available_slots()
+                for position in positions[:free_seats]:
+                    taxi.assign_passenger(Passenger(requests[position][0]))
+                    results[position] = (taxi.taxi_id, taxi.location, taxi.fare)
+                for position in positions[free_seats:]:
+                    results[position] = (taxi.taxi_id, "Taxi is full", None)
+                if free_seats:
+                    with self.lock:
+                        self.seat_index.update(taxi, free_seats)
+                        self._notify("update", "taxis", taxi_id, self._taxi_row(taxi))
+
+        # Log the bookings in request order
+        records = [(request[0], taxi_id, location, fare) for request, (taxi_id, location, fare) in zip(requests, results) if fare is not None]
+        if records:
+            with self.lock:
+                first_index = len(self.booking_history)
+                self.booking_history.extend(records)
+                self._notify("extend", "history", first_index, records)
+        return results
+
+    def request_any_ride(self, passenger_number, location, fullest_first=True):
+        """Book a seat on any non-full taxi serving location, filling the fullest taxi first by default."""
+        while True:
+            with self.lock:
+                taxi = self.seat_index.find(location, fullest_first)
+            if taxi is None:
+                return None, None, None
+            result = self.request_ride(passenger_number, taxi.taxi_id)
+            if result[2] is not None:
+                return result
+            # Another thread filled or retired the taxi after it was found, so look again
+
+    def _taxi_row(self, taxi):
+        return (taxi.taxi_id, taxi.location, taxi.fare, len(taxi.passengers), taxi.available_slots())
 
     def view_taxis(self):
         """View all taxis and their passenger counts."""
-        taxi_info = []
-        for taxi in self.taxis:
-            slots_used = len(taxi.passengers)
-            taxi_info.append((taxi.taxi_id, taxi.location, taxi.fare, slots_used, taxi.available_slots()))
-        return taxi_info
+        with self.lock:
+            return [self._taxi_row(taxi) for taxi in self.taxis.values()]
 
-    def get_booking_history(self):
-        """Retrieve booking history."""
-        return self.booking_history
+    def get_booking_history(self, offset=0, limit=None):
+        """Retrieve booking history, optionally one page of limit records starting at offset."""
+        with self.lock:
+            if limit is None:
+                return self.booking_history[offset:] if offset else self.booking_history
+            return self.booking_history[offset:offset + limit]
+
+    def count_booking_history(self):
+        """Return the number of bookings in the history."""
+        return len(self.booking_history)
 
 # ==============================
 # Tkinter GUI Implementation
 # ==============================
+def load_tkinter():
+    """Import Tkinter the first time the GUI needs it."""
+    global tk, ttk
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk
+
+class VirtualHistoryView:
+    """Show a fixed window of booking history rows in a Treeview, fetching pages as it scrolls."""
+    def __init__(self, tree, scrollbar, fetch_page, count_rows):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch_page = fetch_page  # fetch_page(offset, limit) -> list of rows
+        self.count_rows = count_rows  # count_rows() -> total number of rows
+        self.offset = 0
+        self.page_size = int(tree.cget("height"))
+        self.total = 0  # Number of rows when the view was last rendered
+
+        self.scrollbar.config(command=self.on_scroll)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-1))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(1))
+
+    def on_scroll(self, action, amount, unit=None):
+        """Handle the scrollbar's moveto/scroll commands."""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.count_rows()))
+        else:
+            step = self.page_size if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll_by(-1 if event.delta > 0 else 1)
+        return "break"
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset):
+        """Move the window so it starts at offset, clamped to the available rows."""
+        total = self.count_rows()
+        self.offset = max(0, min(offset, total - self.page_size))
+        self.render(total)
+
+    def row_appended(self):
+        """Follow the newest rows if the end was in view, otherwise only move the scrollbar.
+
+        The end was in view if the window reached the last row rendered before this append,
+        however many rows a batch appended since.
+        """
+        total = self.count_rows()
+        if self.offset + self.page_size >= self.total:
+            self.scroll_to(total)
+        else:
+            self.render(total)
+
+    def render(self, total=None):
+        """Reuse the existing Treeview rows for the current page instead of recreating them."""
+        if total is None:
+            total = self.count_rows()
+        self.total = total
+        rows = self.fetch_page(self.offset, self.page_size)
+        items = self.tree.get_children()
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=values)
+        for item in items[len(rows):]:
+            self.tree.delete(item)
+        for values in rows[len(items):]:
+            self.tree.insert("", "end", values=values)
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(rows)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
 class TaxiBookingApp:
     def __init__(self, root, system):
+        load_tkinter()
         self.root = root
         self.system = system
 
@@ -145,18 +815,19 @@ class TaxiBookingApp:
         self.history_scrollbar = tk.Scrollbar(self.history_frame, orient="vertical")
 
         # Create Treeview for booking history
-        self.history_tree = ttk.Treeview(self.history_frame, columns=("Phone Number", "Taxi ID", "Location", "Fare"), show="headings", height=5, yscrollcommand=self.history_scrollbar.set)
+        self.history_tree = ttk.Treeview(self.history_frame, columns=("Phone Number", "Taxi ID", "Location", "Fare"), show="headings", height=5)
         self.history_tree.heading("Phone Number", text="Phone Number")
         self.history_tree.heading("Taxi ID", text="Taxi ID")
         self.history_tree.heading("Location", text="Location")
         self.history_tree.heading("Fare", text="Fare (Frw)")
         self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        # Attach the scrollbar to the Treeview
-        self.history_scrollbar.config(command=self.history_tree.yview)
+        # The scrollbar spans the whole history; only the visible page is kept in the Treeview
         self.history_scrollbar.pack(side=tk.RIGHT, fill="y")
+        self.history_view = VirtualHistoryView(self.history_tree, self.history_scrollbar, self.system.get_booking_history, self.system.count_booking_history)
 
         self.refresh_ui()
+        self.system.subscribe(self.on_system_change)
 
     def toggle_fullscreen(self):
         """Toggle between full-screen and windowed mode."""
@@ -221,8 +892,6 @@ class TaxiBookingApp:
         else:
             self.show_custom_popup("No Taxi Selected", "Please select a taxi from the list.", "warning")
 
-        self.refresh_ui()
-
     def show_custom_popup(self, title, message, popup_type):
         """Display a custom popup window with a given title, message, and popup type (success, warning, error)."""
         popup = tk.Toplevel(self.root)
@@ -253,44 +922,62 @@ class TaxiBookingApp:
         popup.grab_set()  # Prevent interaction with the main window until this popup is closed
 
     def refresh_ui(self):
-        """Refresh the lists of taxis in the GUI."""
+        """Rebuild the lists of taxis and bookings in the GUI from scratch."""
         # Refresh taxi list
         for row in self.taxi_tree.get_children():
             self.taxi_tree.delete(row)
         taxis = self.system.view_taxis()
         for taxi in taxis:
-            self.taxi_tree.insert("", "end", values=taxi)
+            self.taxi_tree.insert("", "end", iid=taxi[0], values=taxi)
 
         # Refresh booking history
-        for row in self.history_tree.get_children():
-            self.history_tree.delete(row)
+        self.history_view.render()
 
-        history = self.system.get_booking_history()
-        for record in history:
-            self.history_tree.insert("", "end", values=record)
+    def on_system_change(self, event, table, key, row):
+        """Patch only the rows affected by a change instead of rebuilding the lists."""
+        if table == "history":
+            if event in ("insert", "extend"):
+                self.history_view.row_appended()
+            return
+
+        if event == "reload":
+            self.refresh_ui()
+        elif event == "update":
+            self.taxi_tree.item(key, values=row)
+        elif event == "delete":
+            self.taxi_tree.delete(key)
+        elif event == "insert":
+            # Keep the list in Taxi ID order by inserting before the next taxi
+            next_taxi = self.system.next_taxi_after(key)
+            index = self.taxi_tree.index(next_taxi.taxi_id) if next_taxi else "end"
+            self.taxi_tree.insert("", index, iid=key, values=row)
 
 # ==============================
 # Main Execution
 # ==============================
+DEFAULT_FLEET = [
+    ("Kigali-Huye", 3900),
+    ("Kigali-Musanze", 3500),
+    ("Kigali-Nyagatare", 4000),
+    ("Kigali-Rusizi", 9000),
+    ("Huye-Kigali", 3900),
+    ("Musanze-Kigali", 3500),
+    ("Nyagatare-Kigali", 4000),
+    ("Rusizi-Kigali", 9000),
+]
+
 def main():
-    system = TaxiBookingSystem()
+    log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "avl_bookings.log")
+    system = TaxiBookingSystem(log_path)
 
     # Add some taxis with predefined locations and fares
-    locations_with_fares = [
-        ("Kigali-Huye", 3900),
-        ("Kigali-Musanze", 3500),
-        ("Kigali-Nyagatare", 4000),
-        ("Kigali-Rusizi", 9000),
-        ("Huye-Kigali", 3900),
-        ("Musanze-Kigali", 3500),
-        ("Nyagatare-Kigali", 4000),
-        ("Rusizi-Kigali", 9000),
-    ]
-    for location, fare in locations_with_fares:
-        system.add_taxi(location, fare)
+    system.add_taxis(DEFAULT_FLEET)
 
+    load_tkinter()
     root = tk.Tk()
     app = TaxiBookingApp(root, system)
     root.mainloop()
+    system.booking_history.close()
 
-main()
+if __name__ == "__main__":
+    main()
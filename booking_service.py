@@ -0,0 +1,264 @@
+import asyncio
+import argparse
+import importlib.util
+import json
+import os
+import random
+import time
+
+# ==============================
+# Booking Cores
+# ==============================
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def load_module(file_name, module_name):
+    """Import one of the booking modules by file name (some of them have spaces in their names)."""
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(HERE, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Operations clients may call on each system, so a request can never reach other attributes
+OPERATIONS = {
+    "avl": {"add_taxi", "remove_taxi", "request_ride", "request_any_ride", "view_taxis", "taxis_in_fare_range", "count_booking_history", "get_booking_history"},
+    "dll": {"add_taxi", "request_ride", "request_any_ride", "cancel_ride", "waiting_bookings", "next_ride", "transfer_passengers", "view_taxis", "find_taxis"},
+    "array": {"add_taxi", "request_ride", "get_booking_history", "count_booking_history", "price_routes", "revenue_by_route", "bookings_by_taxi", "bookings_by_hour"},
+    "heap": {"add_booking", "add_bookings", "serve_booking", "serve_batch", "view_bookings", "wait_percentiles", "enable_metrics", "disable_metrics", "metrics_report"},
+}
+
+def create_systems(taxis_per_route=1):
+    """Create one booking core per module, each seeded with the same fleet as its GUI."""
+    avl = load_module("avl_inked_list1.py", "avl_inked_list1")
+    dll = load_module("Double_LL3.py", "Double_LL3")
+    array = load_module("arrayresults4.py", "arrayresults4")
+    heap = load_module("Heap sort5.py", "heap_sort5")
+
+    systems = {
+        "avl": avl.TaxiBookingSystem(),
+        "dll": dll.TaxiBookingSystem(),
+        "array": array.TaxiBookingSystem(),
+        "heap": heap.RideShareHeap(aging_interval=heap.DEFAULT_AGING_INTERVAL),
+    }
+    systems["avl"].add_taxis(avl.DEFAULT_FLEET * taxis_per_route)
+    systems["dll"].add_taxis(dll.DEFAULT_FLEET * taxis_per_route)
+    for (_, destination), fare in systems["array"].routes.items():
+        for _ in range(taxis_per_route):
+            systems["array"].add_taxi(destination, fare)
+    return systems
+
+def to_json(value):
+    """Convert results (sequences, history stores, taxis, passengers) into JSON-friendly values."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {"-".join(key) if isinstance(key, tuple) else str(key): to_json(item) for key, item in value.items()}
+    if hasattr(value, "passenger_number"):
+        return value.passenger_number
+    if hasattr(value, "taxi_id"):
+        # The same row the cores' view_taxis returns
+        return [value.taxi_id, value.location, value.fare, len(value.passengers), value.available_slots()]
+    if hasattr(value, "__iter__"):
+        return [to_json(item) for item in value]  # Lists, tuples, sets and the BookingLog/ColumnarHistory stores
+    return value
+
+def error_response(request_id, error):
+    return {"id": request_id, "error": f"{type(error).__name__}: {error}"}
+
+# ==============================
+# Asyncio Service
+# ==============================
+class BookingService:
+    """Serves JSON booking requests over a local socket, one request and one response per line.
+
+    Request:  {"id": 1, "system": "array", "op": "request_ride", "args": ["0781234567", "Kigali", "Huye"]}
+    Response: {"id": 1, "result": [...]} or {"id": 1, "error": "..."}
+
+    Every connection feeds one bounded queue that a single worker drains, so the booking
+    cores are only ever touched by one coroutine. When the queue is full, connections stop
+    reading from their sockets until it has room again. Runs of request_ride calls for the
+    same system are booked through request_rides_batch.
+    """
+    def __init__(self, systems, queue_size=1024, batch_size=256, max_in_flight=128):
+        self.systems = systems
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight  # Unanswered requests allowed per connection
+        self.queue = None
+        self.handled = 0
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        worker = asyncio.create_task(self.run_worker())
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"Booking service listening on {host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            worker.cancel()
+
+    async def handle_client(self, reader, writer):
+        pending = asyncio.Queue(maxsize=self.max_in_flight)  # Responses still owed, in request order
+        responder = asyncio.create_task(self.send_responses(pending, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                future = asyncio.get_running_loop().create_future()
+                await pending.put(future)
+                await self.submit(line, future)
+        finally:
+            await pending.put(None)
+            await responder
+            writer.close()
+
+    async def submit(self, line, future):
+        """Validate a request line and queue it for the worker, or answer it with an error right away."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request is not an object")
+            request_id = request.get("id")
+            system_name, op, args = request["system"], request["op"], request.get("args", [])
+            if not isinstance(system_name, str) or not isinstance(op, str) or not isinstance(args, list):
+                raise ValueError("system and op must be strings and args a list")
+            known = op in OPERATIONS.get(system_name, ())
+        except Exception:
+            # Whatever the line holds, it gets an answer, or its connection would wait forever
+            future.set_result({"id": request_id, "error": "Malformed request"})
+            return
+        if not known:
+            future.set_result({"id": request_id, "error": f"Unknown operation {system_name}.{op}"})
+            return
+        await self.queue.put((request_id, system_name, op, args, future))
+
+    async def send_responses(self, pending, writer):
+        while True:
+            future = await pending.get()
+            if future is None:
+                break
+            response = await future
+            try:
+                data = json.dumps(response)
+            except (TypeError, ValueError) as error:
+                data = json.dumps(error_response(response.get("id"), error))
+            writer.write((data + "\n").encode())
+            await writer.drain()
+
+    async def run_worker(self):
+        while True:
+            jobs = [await self.queue.get()]
+            while len(jobs) < self.batch_size and not self.queue.empty():
+                jobs.append(self.queue.get_nowait())
+            try:
+                self.run_jobs(jobs)
+            except Exception as error:
+                # Never let one batch end the only worker. Answer whatever it left unanswered.
+                for job in jobs:
+                    self.answer(job, error_response(job[0], error))
+            await asyncio.sleep(0)  # Let connections read and write between batches
+
+    def run_jobs(self, jobs):
+        """Run queued jobs in order, turning consecutive request_ride jobs for one system into one batch."""
+        start = 0
+        while start < len(jobs):
+            system_name, op = jobs[start][1], jobs[start][2]
+            system = self.systems[system_name]
+            end = start + 1
+            if op == "request_ride" and hasattr(system, "request_rides_batch"):
+                while end < len(jobs) and jobs[end][1] == system_name and jobs[end][2] == "request_ride":
+                    end += 1
+            run = jobs[start:end]
+            if len(run) > 1:
+                self.run_batch(system, run)
+            else:
+                self.run_job(system, run[0])
+            start = end
+        self.handled += len(jobs)
+
+    def run_batch(self, system, run):
+        try:
+            results = system.request_rides_batch([tuple(job[3]) for job in run])
+        except (TypeError, ValueError):
+            # The cores check a whole batch before seating anyone, so a malformed request spoils
+            # the batch without booking it. Fall back to one call each to report it.
+            for job in run:
+                self.run_job(system, job)
+            return
+        except Exception as error:
+            # Anything else may have struck after some seats were taken, so retrying could book twice
+            for job in run:
+                self.answer(job, error_response(job[0], error))
+            return
+        for job, result in zip(run, results):
+            self.answer(job, {"id": job[0], "result": to_json(result)})
+
+    def run_job(self, system, job):
+        request_id, _, op, args, _ = job
+        try:
+            response = {"id": request_id, "result": to_json(getattr(system, op)(*args))}
+        except Exception as error:
+            response = error_response(request_id, error)
+        self.answer(job, response)
+
+    def answer(self, job, response):
+        future = job[4]
+        if not future.done():
+            future.set_result(response)
+
+# ==============================
+# Load Generator
+# ==============================
+async def generate_load(host="127.0.0.1", port=8765, clients=50, requests_per_client=2000):
+    """Pipeline request_ride calls from many concurrent clients and report the request rate."""
+    destinations = ["Huye", "Musanze", "Nyagatare", "Rusizi"]
+
+    async def run_client(client_number):
+        reader, writer = await asyncio.open_connection(host, port)
+
+        async def send_requests():
+            for i in range(requests_per_client):
+                phone = f"078{random.randint(0, 9999999):07d}"
+                request = {"id": i, "system": "array", "op": "request_ride", "args": [phone, "Kigali", random.choice(destinations)]}
+                writer.write((json.dumps(request) + "\n").encode())
+                await writer.drain()
+
+        sender = asyncio.create_task(send_requests())
+        errors = 0
+        for _ in range(requests_per_client):
+            if "error" in json.loads(await reader.readline()):
+                errors += 1
+        await sender
+        writer.close()
+        await writer.wait_closed()
+        return errors
+
+    start = time.perf_counter()
+    errors = sum(await asyncio.gather(*(run_client(i) for i in range(clients))))
+    elapsed = time.perf_counter() - start
+    total = clients * requests_per_client
+    print(f"{total} requests from {clients} clients in {elapsed:.2f}s: {total / elapsed:.0f} requests/s, {errors} errors")
+
+# ==============================
+# Main Execution
+# ==============================
+def main():
+    parser = argparse.ArgumentParser(description="Headless taxi booking service.")
+    parser.add_argument("mode", choices=["serve", "load"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--taxis-per-route", type=int, default=1000, help="fleet size to seed each route with (serve)")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent clients (load)")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per client (load)")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        service = BookingService(create_systems(args.taxis_per_route))
+        asyncio.run(service.serve(args.host, args.port))
+    else:
+        asyncio.run(generate_load(args.host, args.port, args.clients, args.requests))
+
+if __name__ == "__main__":
+    main()
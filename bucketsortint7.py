@@ -1,6 +1,5 @@
-import tkinter as tk
-from tkinter import ttk
-from tkinter import messagebox
+# Tkinter is imported by load_tkinter() when the GUI starts, so the booking classes can be used without it
+tk = ttk = messagebox = None
 
 
 # Class representing each ride with a priority score
@@ -55,6 +54,14 @@ class TaxiBookingSystem:
         return self.rides
 
 
+def load_tkinter():
+    """Import Tkinter the first time the GUI needs it."""
+    global tk, ttk, messagebox
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk
+        from tkinter import messagebox
+
 class FlashyPopup:
     def __init__(self, parent, message, title="Notification"):
         self.popup = tk.Toplevel(parent)
@@ -93,6 +100,7 @@ class FlashyPopup:
 
 class TaxiBookingApp:
     def __init__(self, root, system):
+        load_tkinter()
         self.root = root
         self.system = system
 
@@ -226,6 +234,7 @@ class TaxiBookingApp:
 # Run the application
 if __name__ == "__main__":
     system = TaxiBookingSystem()
+    load_tkinter()
     root = tk.Tk()
     app = TaxiBookingApp(root, system)
     root.mainloop()
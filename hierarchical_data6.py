@@ -1,14 +1,29 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
+# Tkinter is imported by load_tkinter() when the GUI starts, so the booking classes can be used without it
+tk = ttk = messagebox = None
 
 class TreeNode:
+    __slots__ = ("node_id", "data", "parent", "children")
+
     def __init__(self, node_id, data):
         self.node_id = node_id
         self.data = data
-        self.children = []
+        self.parent = None
+        self.children = {}  # Child node -> None, kept in insertion order so a child can be detached in O(1)
 
     def add_child(self, child_node):
-        self.children.append(child_node)
+        child_node.parent = self
+        self.children[child_node] = None
+
+    def remove_child(self, child_node):
+        del self.children[child_node]
+        child_node.parent = None
+
+def load_tkinter():
+    """Import Tkinter the first time the GUI needs it."""
+    global tk, ttk, messagebox
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk, messagebox
 
 class CustomMessageBox:
     def __init__(self, parent, message, title="Message", button_text="OK"):
@@ -35,32 +50,80 @@ class CustomMessageBox:
 class TaxiBookingSystem:
     def __init__(self):
         self.root = TreeNode("root", {"type": "system", "description": "Taxi Booking System Root"})
+        # Node ID -> node, for every node added through the system. When an ID is used more
+        # than once, it keeps the first node added with it. Nodes attached with TreeNode.add_child
+        # directly are missing until find_node comes across them.
+        self.nodes = {"root": self.root}
+
+    def add_node(self, parent_node, node):
+        parent_node.add_child(node)
+        self.nodes.setdefault(node.node_id, node)
+        return node
+
+    def add_region(self, region_id):
+        return self.add_node(self.root, TreeNode(f"region_{region_id}", {"type": "region"}))
 
     def add_ride(self, region_id, ride_id, ride_data):
         region_node = self.find_node(self.root, region_id)
         if region_node:
-            ride_node = TreeNode(f"ride_{ride_id}", {"type": "ride", "data": ride_data})
-            region_node.add_child(ride_node)
+            self.add_node(region_node, TreeNode(f"ride_{ride_id}", {"type": "ride", "data": ride_data}))
             return True
         return False
 
+    def move_node(self, node_id, new_parent_id):
+        """Move a node, with everything under it, to another parent. Returns False if that is not possible.
+
+        Checking that the new parent is not inside the moved subtree walks up from the new parent,
+        so the cost is the depth of the tree rather than its size.
+        """
+        node = self.find_node(self.root, node_id)
+        new_parent = self.find_node(self.root, new_parent_id)
+        if node is None or new_parent is None or node is self.root:
+            return False
+        ancestor = new_parent
+        while ancestor is not None:
+            if ancestor is node:
+                return False
+            ancestor = ancestor.parent
+        node.parent.remove_child(node)
+        new_parent.add_child(node)
+        return True
+
     def find_node(self, current_node, target_id):
-        if current_node.node_id == target_id:
-            return current_node
-        for child in current_node.children:
-            result = self.find_node(child, target_id)
-            if result:
-                return result
+        """Return the first node with target_id at or under current_node, or None."""
+        node = self.nodes.get(target_id)
+        ancestor = node
+        while ancestor is not None and ancestor is not current_node:
+            ancestor = ancestor.parent
+        if ancestor is not None:
+            return node
+        # The ID is not indexed, or its indexed node lies elsewhere, so search under current_node
+        for candidate in self.walk(current_node):
+            if candidate.node_id == target_id:
+                if node is None:
+                    self.nodes[target_id] = candidate  # Attached with add_child, so index it now
+                return candidate
         return None
 
+    def walk(self, node):
+        """Yield node and everything under it in depth-first order, without recursion."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
     def display_tree(self, node, tree_view, parent=""):
-        data_display = f"Type: {node.data.get('type', 'N/A')}, Data: {node.data.get('description', node.data.get('data', 'N/A'))}"
-        node_id = tree_view.insert(parent, "end", text=f"{node.node_id}", values=[data_display])
-        for child in node.children:
-            self.display_tree(child, tree_view, node_id)
+        stack = [(node, parent)]
+        while stack:
+            node, parent = stack.pop()
+            data_display = f"Type: {node.data.get('type', 'N/A')}, Data: {node.data.get('description', node.data.get('data', 'N/A'))}"
+            item = tree_view.insert(parent, "end", text=f"{node.node_id}", values=[data_display])
+            stack.extend((child, item) for child in reversed(node.children))
 
 class TaxiBookingApp:
     def __init__(self, root, system):
+        load_tkinter()
         self.root = root
         self.system = system
 
@@ -152,8 +215,7 @@ class TaxiBookingApp:
         """
         region_id = self.region_id_entry.get()
         if region_id:
-            region_node = TreeNode(f"region_{region_id}", {"type": "region"})
-            self.system.root.add_child(region_node)
+            self.system.add_region(region_id)
             self.update_tree_view()
             CustomMessageBox(self.root, f"Region '{region_id}' added successfully!", title="Success")
         else:
@@ -210,6 +272,7 @@ class TaxiBookingApp:
 
 # Run the application
 if __name__ == "__main__":
+    load_tkinter()
     root = tk.Tk()
     system = TaxiBookingSystem()
     app = TaxiBookingApp(root, system)
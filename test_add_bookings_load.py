@@ -0,0 +1,71 @@
+"""Load benchmark: RideShareHeap.add_bookings must queue 1,000,000 bookings in under 6.5x the time of sorting them.
+
+The bookings go into a heap that already holds a small queue, without a journal, so the
+time is that of building the lanes and indexes. It is compared with building and sorting
+the same bookings as plain tuples, timed in the same run, so a slower machine moves both.
+Run with pytest, or directly: python test_add_bookings_load.py
+"""
+import random
+import time
+
+from booking_service import load_module
+
+heap_module = load_module("Heap sort5.py", "heap_sort5")
+RideShareHeap = heap_module.RideShareHeap
+
+BOOKINGS = 1000000
+LIMIT = 6.5  # add_bookings time as a multiple of the reference sort
+ATTEMPTS = 3  # The load is repeated only while a busy machine keeps it over the limit
+
+
+def make_requests(count):
+    random.seed(7)
+    levels = ["low", "medium", "high", "emergency"]
+    destinations = ["Huye", "Musanze", "Nyagatare", "Rusizi"]
+    return [(f"078{number:07d}", random.choice(levels), "Kigali", random.choice(destinations)) for number in range(count)]
+
+
+def sort_bookings(requests):
+    """Time the least work any queue must do: build one tuple per request and sort them."""
+    priority_map = RideShareHeap().priority_map
+    started = time.perf_counter()
+    bookings = [(priority_map[level], number, phone_number, start, destination)
+                for number, (phone_number, level, start, destination) in enumerate(requests)]
+    bookings.sort()
+    return time.perf_counter() - started
+
+
+def load(requests):
+    """Time add_bookings on a heap with a few bookings already waiting. Returns the seconds and the heap."""
+    heap = RideShareHeap(aging_interval=60)
+    for request in requests[:100]:
+        heap.add_booking(*request)
+    started = time.perf_counter()
+    heap.add_bookings(requests)
+    return time.perf_counter() - started, heap
+
+
+def check_load():
+    requests = make_requests(BOOKINGS)
+    ratios = []
+    for _ in range(ATTEMPTS):
+        reference = sort_bookings(requests)
+        elapsed, heap = load(requests)
+        assert len(heap) == BOOKINGS + 100
+        assert heap.view_bookings(limit=10) == sorted(heap.view_bookings(limit=10), key=lambda row: row[1])
+        del heap
+        ratios.append((elapsed / reference, elapsed))
+        if elapsed / reference < LIMIT:
+            break
+    ratio, elapsed = min(ratios)
+    assert ratio < LIMIT, f"add_bookings took {ratio:.1f}x as long as sorting {BOOKINGS} bookings"
+    return ratio, elapsed
+
+
+def test_million_bookings_load_in_under_6_5x_a_sort():
+    check_load()
+
+
+if __name__ == "__main__":
+    ratio, seconds = check_load()
+    print(f"add_bookings: {BOOKINGS} bookings in {seconds:.2f} s, {BOOKINGS / seconds:.0f} bookings/s, {ratio:.1f}x a plain sort")
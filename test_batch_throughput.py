@@ -0,0 +1,77 @@
+"""Throughput benchmark: request_rides_batch against one request_ride call per booking.
+
+Each booking module takes 20,000 bookings both ways on identical fleets, best of three
+runs. The batch must never be slower than the loop (20% is allowed for timing noise).
+Most of its saving is in the GUI, so avl_inked_list1, whose GUI listens for changes, must
+also send one change per taxi and one history append instead of two changes per booking.
+Run with pytest, or directly: python test_batch_throughput.py
+"""
+import time
+
+from booking_service import load_module
+
+MODULES = {"avl": "avl_inked_list1.py", "dll": "Double_LL3.py", "array": "arrayresults4.py"}
+BOOKINGS = 20000
+RUNS = 3
+LIMIT = 0.8  # Batch rate as a share of the loop rate
+
+
+def make_system(module, name):
+    """Return a system with seats for every booking, and the requests to fill them."""
+    system = module.TaxiBookingSystem()
+    if name == "array":
+        for _ in range(BOOKINGS // 5):
+            system.add_taxi("Huye", 3900)
+        return system, [(f"078{number:07d}", "Kigali", "Huye") for number in range(BOOKINGS)]
+    system.add_taxis([("Kigali-Huye", 3900)] * (BOOKINGS // 28 + 1))
+    taxi_ids = list(system.taxi_index)
+    return system, [(f"078{number:07d}", taxi_ids[number % len(taxi_ids)]) for number in range(BOOKINGS)]
+
+
+def rates(name):
+    """Return the best loop and batch booking rates, in bookings per second."""
+    module = load_module(MODULES[name], MODULES[name][:-3])
+    loop, batch = [], []
+    for _ in range(RUNS):
+        system, requests = make_system(module, name)
+        started = time.perf_counter()
+        for request in requests:
+            system.request_ride(*request)
+        loop.append(time.perf_counter() - started)
+
+        system, requests = make_system(module, name)
+        started = time.perf_counter()
+        results = system.request_rides_batch(requests)
+        batch.append(time.perf_counter() - started)
+        assert all(result[2] is not None for result in results)
+    return BOOKINGS / min(loop), BOOKINGS / min(batch)
+
+
+def notifications(book):
+    """Return how many changes an avl_inked_list1 listener is sent while book(system, requests) runs."""
+    module = load_module("avl_inked_list1.py", "avl_inked_list1")
+    system, requests = make_system(module, "avl")
+    events = []
+    system.subscribe(lambda *event: events.append(event))
+    book(system, requests)
+    return len(events)
+
+
+def test_batch_is_not_slower_than_a_loop():
+    for name in MODULES:
+        loop_rate, batch_rate = rates(name)
+        assert batch_rate >= LIMIT * loop_rate, f"{name}: batch {batch_rate:.0f}/s, loop {loop_rate:.0f}/s"
+
+
+def test_batch_sends_one_change_per_taxi():
+    taxis = BOOKINGS // 28 + 1
+    assert notifications(lambda system, requests: [system.request_ride(*request) for request in requests]) == 2 * BOOKINGS
+    assert notifications(lambda system, requests: system.request_rides_batch(requests)) == taxis + 1
+
+
+if __name__ == "__main__":
+    for name in MODULES:
+        loop_rate, batch_rate = rates(name)
+        print(f"{name}: loop {loop_rate:.0f} bookings/s, batch {batch_rate:.0f} bookings/s ({batch_rate / loop_rate:.1f}x)")
+    test_batch_sends_one_change_per_taxi()
+    print("avl: batch sends one change per taxi")
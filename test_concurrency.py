@@ -0,0 +1,109 @@
+"""Stress tests for the per-taxi locks: many threads booking one taxi must never overbook it.
+
+Run with pytest, or directly: python test_concurrency.py
+"""
+import sys
+import threading
+
+from booking_service import load_module
+
+THREADS = 32
+REQUESTS_PER_THREAD = 50
+
+
+def hammer(book, threads=THREADS, requests_per_thread=REQUESTS_PER_THREAD):
+    """Call book(thread number, request number) from many threads released at once. Returns every result."""
+    results = [[] for _ in range(threads)]
+    start = threading.Barrier(threads)
+
+    def worker(thread_number):
+        start.wait()
+        for request_number in range(requests_per_thread):
+            results[thread_number].append(book(thread_number, request_number))
+
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible to provoke races
+    try:
+        workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(old_interval)
+    return [result for thread_results in results for result in thread_results]
+
+
+def phone(thread_number, request_number):
+    return f"078{thread_number:03d}{request_number:04d}"
+
+
+def test_avl_one_taxi_never_exceeds_28_seats():
+    avl = load_module("avl_inked_list1.py", "avl_inked_list1")
+    system = avl.TaxiBookingSystem()
+    taxi_id = system.add_taxi("Huye", 3900)
+
+    results = hammer(lambda thread, request: system.request_ride(phone(thread, request), taxi_id))
+
+    booked = [result for result in results if result[2] is not None]
+    taxi = system.get_taxi(taxi_id)
+    assert len(booked) == len(taxi.passengers) == taxi.capacity == 28
+    assert len(system.booking_history) == 28
+    assert system.seat_index.find("Huye") is None
+
+
+def test_avl_batches_and_any_ride_never_exceed_28_seats():
+    avl = load_module("avl_inked_list1.py", "avl_inked_list1")
+    system = avl.TaxiBookingSystem()
+    taxi_id = system.add_taxi("Huye", 3900)
+
+    def book(thread, request):
+        if thread % 2:
+            return system.request_rides_batch([(phone(thread, request), taxi_id)])[0]
+        return system.request_any_ride(phone(thread, request), "Huye")
+
+    booked = [result for result in hammer(book) if result[2] is not None]
+    assert len(booked) == len(system.get_taxi(taxi_id).passengers) == len(system.booking_history) == 28
+
+
+def test_dll_one_taxi_never_exceeds_28_seats():
+    dll = load_module("Double_LL3.py", "Double_LL3")
+    system = dll.TaxiBookingSystem()
+    taxi_id = system.add_taxi("Huye", 3900)
+
+    def book(thread, request):
+        if thread % 4 == 3 and request % 5 == 4:
+            system.cancel_ride(phone(thread, request - 1))  # Free a seat now and then while others book
+        return system.request_ride(phone(thread, request), taxi_id)
+
+    results = hammer(book)
+
+    taxi = system.taxi_index[taxi_id]
+    assert len(taxi.passengers) <= taxi.capacity == 28
+    assert len(taxi.passengers) == len(system.ride_queue)
+    cancelled = sum(1 for result in results if result[2] is not None) - len(taxi.passengers)
+    assert cancelled >= 0
+
+
+def test_array_one_destination_never_exceeds_5_seats():
+    array = load_module("arrayresults4.py", "arrayresults4")
+    system = array.TaxiBookingSystem()
+    system.add_taxi("Huye", 3900)
+
+    def book(thread, request):
+        if thread % 2:
+            return system.request_rides_batch([(phone(thread, request), "Kigali", "Huye")])[0]
+        return system.request_ride(phone(thread, request), "Kigali", "Huye")
+
+    booked = [result for result in hammer(book) if result[0] is not None]
+    taxi = system.taxis[0]
+    assert len(booked) == len(taxi.passengers) == taxi.capacity == 5
+    assert len(system.booking_history) == 5
+    assert not system.open_taxis["Huye"]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"{name}: ok")
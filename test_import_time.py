@@ -0,0 +1,53 @@
+"""Cold-import benchmark: every booking core must import in under 50 ms without loading Tk.
+
+Each module is copied to an empty directory and imported from there in a fresh interpreter,
+so the time includes compiling it as well as loading the standard-library modules it uses.
+Run with pytest, or directly: python test_import_time.py
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CORES = ["avl_inked_list1.py", "Double_LL3.py", "arrayresults4.py", "Heap sort5.py", "hierarchical_data6.py", "bucketsortint7.py"]
+LIMIT = 0.050  # Seconds
+RUNS = 5  # Best of, to keep a busy machine from failing the check
+
+IMPORT_SCRIPT = """
+import importlib.util, json, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("core", sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print(json.dumps({"seconds": time.perf_counter() - start, "tkinter": "tkinter" in sys.modules}))
+"""
+
+
+def cold_import(file_name):
+    """Import file_name in a new interpreter with no cached bytecode for it. Returns (seconds, whether Tk was loaded)."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = shutil.copy(os.path.join(HERE, file_name), directory)
+        output = subprocess.run([sys.executable, "-B", "-c", IMPORT_SCRIPT, path],
+                                capture_output=True, text=True, check=True).stdout
+    result = json.loads(output)
+    return result["seconds"], result["tkinter"]
+
+
+def check_core(file_name):
+    runs = [cold_import(file_name) for _ in range(RUNS)]
+    assert not any(loaded_tk for _, loaded_tk in runs), f"{file_name} imported tkinter"
+    best = min(seconds for seconds, _ in runs)
+    assert best < LIMIT, f"{file_name} took {best * 1000:.1f} ms to import"
+    return best
+
+
+def test_cores_import_fast_without_tk():
+    for file_name in CORES:
+        check_core(file_name)
+
+
+if __name__ == "__main__":
+    for file_name in CORES:
+        print(f"{file_name}: {check_core(file_name) * 1000:.1f} ms")
@@ -0,0 +1,57 @@
+"""Memory benchmark: slotted Taxi and Passenger objects must take under 80% of the old dict-backed layout.
+
+Each booking module fills the same fleet of taxis to capacity twice, once with its own
+classes and once with copies of them that drop __slots__ and so carry a __dict__ per
+instance, and tracemalloc measures what each fleet holds. The phone numbers are made
+beforehand, so only the objects' layout is measured.
+Run with pytest, or directly: python test_memory_layout.py
+"""
+import tracemalloc
+
+from booking_service import load_module
+
+MODULES = ["avl_inked_list1.py", "Double_LL3.py", "arrayresults4.py"]
+FLEET = 2000
+PHONES = [f"078{number:07d}" for number in range(FLEET * 28)]  # 28 seats is the most any taxi has
+LIMIT = 0.80  # Slotted size as a share of the dict-backed size
+
+
+def without_slots(cls):
+    """Return a copy of cls without __slots__, laid out like the classes before they were slotted."""
+    namespace = {name: value for name, value in vars(cls).items() if name not in cls.__slots__ and name not in ("__slots__", "__weakref__")}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def fleet_size(taxi_class, passenger_class, passenger_args):
+    """Fill FLEET taxis to capacity. Returns the bytes they hold with their passengers."""
+    tracemalloc.start()
+    try:
+        taxis = []
+        for number in range(FLEET):
+            taxi = taxi_class(f"TAXI-{number:06d}", "Kigali-Huye", 3900)
+            for seat in range(taxi.capacity):
+                taxi.assign_passenger(passenger_class(PHONES[number * 28 + seat], *passenger_args))
+            taxis.append(taxi)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def check_module(file_name):
+    module = load_module(file_name, file_name[:-3])
+    passenger_args = ("Kigali", "Huye") if file_name == "arrayresults4.py" else ()
+    slotted = fleet_size(module.Taxi, module.Passenger, passenger_args)
+    dict_backed = fleet_size(without_slots(module.Taxi), without_slots(module.Passenger), passenger_args)
+    assert slotted < LIMIT * dict_backed, f"{file_name}: {slotted} bytes slotted vs. {dict_backed} dict-backed"
+    return slotted, dict_backed
+
+
+def test_slotted_taxis_and_passengers_are_smaller():
+    for file_name in MODULES:
+        check_module(file_name)
+
+
+if __name__ == "__main__":
+    for file_name in MODULES:
+        slotted, dict_backed = check_module(file_name)
+        print(f"{file_name}: {dict_backed / 2**20:.1f} MiB dict-backed -> {slotted / 2**20:.1f} MiB slotted ({slotted / dict_backed:.0%})")
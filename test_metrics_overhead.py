@@ -0,0 +1,101 @@
+"""RideShareHeap metrics must cost under 2% while they are turned off.
+
+The instrumented methods are compared with copies of themselves that have the metrics
+code removed from their source, on the same workload, taking the best of many short
+interleaved runs. Run with pytest, or directly: python test_metrics_overhead.py
+"""
+import ast
+import gc
+import inspect
+import random
+import textwrap
+import time
+
+from booking_service import load_module
+
+heap_module = load_module("Heap sort5.py", "heap_sort5")
+RideShareHeap = heap_module.RideShareHeap
+
+INSTRUMENTED = ["add_booking", "add_bookings", "serve_batch", "cancel_booking", "change_priority", "view_bookings"]
+LIMIT = 0.02
+RUNS = 300
+ATTEMPTS = 3  # Timing noise on a busy machine can reach the limit, a real regression fails every attempt
+
+
+class StripMetrics(ast.NodeTransformer):
+    """Drop `metrics = self.metrics` and every `if metrics is not None:` block."""
+    def visit_Assign(self, node):
+        if isinstance(node.value, ast.Attribute) and node.value.attr == "metrics":
+            return None
+        return node
+
+    def visit_If(self, node):
+        test = node.test
+        if isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) and test.left.id == "metrics":
+            return None
+        return self.generic_visit(node)
+
+
+def without_metrics(method):
+    tree = ast.parse(textwrap.dedent(inspect.getsource(method)))
+    tree = ast.fix_missing_locations(StripMetrics().visit(tree))
+    namespace = {}
+    exec(compile(tree, inspect.getsourcefile(method), "exec"), vars(heap_module), namespace)
+    return namespace[method.__name__]
+
+
+BareHeap = type("BareHeap", (RideShareHeap,), {name: without_metrics(getattr(RideShareHeap, name)) for name in INSTRUMENTED})
+
+
+def workload(heap_class, requests):
+    """Time a burst of bookings, re-prioritizations, cancellations, serves and listings on a busy queue."""
+    heap = heap_class()
+    backlog, burst = requests[:len(requests) // 2], requests[len(requests) // 2:]
+    heap.add_bookings(backlog)
+    add_booking, serve_booking, view_bookings = heap.add_booking, heap.serve_booking, heap.view_bookings
+    start = time.perf_counter()
+    for request in burst:
+        add_booking(*request)
+    for number in range(1, len(backlog), 10):
+        heap.change_priority(number, "high")
+        heap.cancel_booking(number + 1)
+    for _ in range(len(burst)):
+        serve_booking()
+    for _ in range(len(burst) // 10):
+        view_bookings(limit=10)
+    return time.perf_counter() - start
+
+
+def measure():
+    """Return the overhead of disabled metrics, from the best of many short interleaved runs."""
+    random.seed(7)
+    levels = ["low", "medium", "high", "emergency"]
+    destinations = ["Huye", "Musanze", "Nyagatare", "Rusizi"]
+    requests = [(f"078{number:07d}", random.choice(levels), "Kigali", random.choice(destinations)) for number in range(2000)]
+    bare, disabled = [], []
+    gc.disable()
+    try:
+        for _ in range(RUNS):
+            bare.append(workload(BareHeap, requests))
+            disabled.append(workload(RideShareHeap, requests))
+    finally:
+        gc.enable()
+    return min(disabled) / min(bare) - 1
+
+
+def test_stripped_copies_have_no_metrics_code():
+    for name in INSTRUMENTED:
+        assert "metrics" not in getattr(BareHeap, name).__code__.co_names
+
+
+def test_disabled_metrics_cost_under_2_percent():
+    overheads = []
+    for _ in range(ATTEMPTS):
+        overheads.append(measure())
+        if overheads[-1] < LIMIT:
+            return
+    assert False, f"metrics cost {min(overheads):.1%} or more while turned off"
+
+
+if __name__ == "__main__":
+    print(f"metrics off vs. no metrics code: {measure():+.2%}")
@@ -0,0 +1,54 @@
+"""Load test: arrayresults4 request_ride must book as fast behind 20,000 full taxis as behind none.
+
+Two fleets for one destination have the same 100 taxis with free seats, one of them
+behind 20,000 taxis that are already full, and each takes 400 bookings. Bookings only
+look at taxis with free seats, so both runs must be within 2x of each other, where a scan
+of the fleet would make the large one hundreds of times slower.
+Run with pytest, or directly: python test_open_taxis_load.py
+"""
+import time
+
+from booking_service import load_module
+
+array = load_module("arrayresults4.py", "arrayresults4")
+
+OPEN_TAXIS = 100
+FULL_TAXIS = 20000
+BOOKINGS = 400  # Fewer than the 500 free seats of the open taxis
+LIMIT = 2.0  # Allowed slowdown from the fleet without full taxis to the one with them
+ATTEMPTS = 3  # The load is repeated only while a busy machine keeps it over the limit
+
+
+def booking_rate(full_taxis):
+    """Book BOOKINGS rides behind full_taxis full taxis. Returns bookings per second."""
+    system = array.TaxiBookingSystem()
+    for _ in range(full_taxis):
+        system.add_taxi("Huye", 3900)
+    system.request_rides_batch([(f"079{number:07d}", "Kigali", "Huye") for number in range(full_taxis * 5)])
+    for _ in range(OPEN_TAXIS):
+        system.add_taxi("Huye", 3900)
+    started = time.perf_counter()
+    for number in range(BOOKINGS):
+        taxi_id, _, _ = system.request_ride(f"078{number:07d}", "Kigali", "Huye")
+        assert taxi_id is not None
+    return BOOKINGS / (time.perf_counter() - started)
+
+
+def check_load():
+    slowdowns = []
+    for _ in range(ATTEMPTS):
+        small, large = booking_rate(0), booking_rate(FULL_TAXIS)
+        slowdowns.append(small / large)
+        if slowdowns[-1] < LIMIT:
+            break
+    assert min(slowdowns) < LIMIT, f"booking behind {FULL_TAXIS} full taxis is {min(slowdowns):.1f}x slower"
+    return small, large
+
+
+def test_full_taxis_do_not_slow_down_bookings():
+    check_load()
+
+
+if __name__ == "__main__":
+    small, large = check_load()
+    print(f"{OPEN_TAXIS} open taxis: {small:.0f} bookings/s alone, {large:.0f} bookings/s behind {FULL_TAXIS} full taxis")
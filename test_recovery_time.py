@@ -0,0 +1,92 @@
+"""Recovery benchmark: RideShareHeap must rebuild a 1,000,000-booking backlog in under 12x the time of sorting it.
+
+The backlog is booked with add_bookings, which leaves it in a snapshot, and then changed
+by a tail of single bookings, serves, cancellations and re-prioritizations that stay in
+the log. Recovery is compared with building and sorting the backlog as plain tuples,
+timed in the same run, so a slower machine moves both.
+Run with pytest, or directly: python test_recovery_time.py
+"""
+import os
+import random
+import tempfile
+import time
+
+from booking_service import load_module
+
+heap_module = load_module("Heap sort5.py", "heap_sort5")
+RideShareHeap = heap_module.RideShareHeap
+
+BACKLOG = 1000000
+TAIL = 20000  # Operations logged after the last snapshot
+LIMIT = 12.0  # Recovery time as a multiple of the reference sort
+ATTEMPTS = 3  # Recovery is repeated only while a busy machine keeps it over the limit
+
+
+def sort_bookings(requests):
+    """Time the least work any queue must do: build one tuple per request and sort them."""
+    priority_map = RideShareHeap().priority_map
+    started = time.perf_counter()
+    bookings = [(priority_map[level], number, phone_number, start, destination)
+                for number, (phone_number, level, start, destination) in enumerate(requests)]
+    bookings.sort()
+    return time.perf_counter() - started
+
+
+def build_journal(path, requests):
+    """Book the backlog and its tail into a journal at path. Returns the first rows and size of the queue."""
+    random.seed(8)
+    levels = ["low", "medium", "high", "emergency"]
+    destinations = ["Huye", "Musanze", "Nyagatare", "Rusizi"]
+    heap = RideShareHeap(aging_interval=60, log_path=path, snapshot_every=BACKLOG)
+    started = time.perf_counter()
+    heap.add_bookings(requests)
+    booked = time.perf_counter() - started
+    for number in range(TAIL // 4):
+        heap.add_booking(f"079{number:07d}", random.choice(levels), "Kigali", random.choice(destinations))
+        heap.serve_booking()
+        heap.cancel_booking(number * 40 + 1)
+        heap.change_priority(number * 40 + 2, random.choice(levels))
+    rows, size = heap.view_bookings(limit=1000), len(heap)
+    heap.close()
+    return rows, size, booked
+
+
+def recover(path):
+    """Reopen the journal at path. Returns the seconds it took and the recovered heap's first rows and size."""
+    started = time.perf_counter()
+    heap = RideShareHeap(aging_interval=60, log_path=path)
+    elapsed = time.perf_counter() - started
+    rows, size = heap.view_bookings(limit=1000), len(heap)
+    heap.close()
+    return elapsed, rows, size
+
+
+def check_recovery():
+    random.seed(7)
+    levels = ["low", "medium", "high", "emergency"]
+    destinations = ["Huye", "Musanze", "Nyagatare", "Rusizi"]
+    requests = [(f"078{number:07d}", random.choice(levels), "Kigali", random.choice(destinations)) for number in range(BACKLOG)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bookings.log")
+        rows, size, booked = build_journal(path, requests)
+        assert os.path.getsize(path) > 0, "the tail should still be in the log"
+        ratios = []
+        for _ in range(ATTEMPTS):
+            reference = sort_bookings(requests)
+            elapsed, recovered_rows, recovered_size = recover(path)
+            assert (recovered_rows, recovered_size) == (rows, size)
+            ratios.append((elapsed / reference, elapsed))
+            if elapsed / reference < LIMIT:
+                break
+    ratio, elapsed = min(ratios)
+    assert ratio < LIMIT, f"recovering {size} bookings took {ratio:.1f}x as long as sorting them"
+    return ratio, elapsed, booked, size
+
+
+def test_million_booking_backlog_recovers_in_under_12x_a_sort():
+    check_recovery()
+
+
+if __name__ == "__main__":
+    ratio, recovered, booked, size = check_recovery()
+    print(f"{size} waiting bookings: booked in {booked:.2f} s, recovered in {recovered:.2f} s, {ratio:.1f}x a plain sort")
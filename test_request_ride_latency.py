@@ -0,0 +1,53 @@
+"""Latency benchmark: avl_inked_list1 request_ride must cost about the same with 10 or 100,000 taxis.
+
+Each fleet takes the same number of bookings, spread over its taxis, and every call is
+timed on its own. The median at 100,000 taxis must stay within 5x of the median at 10. The
+indexes make the same few lookups at any size, and only cache misses grow with the fleet,
+while a scan of the fleet would make it thousands of times slower.
+Run with pytest, or directly: python test_request_ride_latency.py
+"""
+import gc
+import statistics
+import time
+
+from booking_service import load_module
+
+avl = load_module("avl_inked_list1.py", "avl_inked_list1")
+
+FLEETS = [10, 1000, 100000]
+BOOKINGS = 200  # Per fleet, so the 10-taxi fleet is never full
+LIMIT = 5.0  # Allowed slowdown of the median booking from the smallest to the largest fleet
+
+
+def median_latency(fleet_size):
+    """Book BOOKINGS rides round-robin over a fleet of fleet_size taxis. Returns the median seconds per call."""
+    system = avl.TaxiBookingSystem()
+    system.add_taxis((f"Route-{number % 8}", 3000 + number % 8 * 500) for number in range(fleet_size))
+    taxi_ids = list(system.taxi_index)
+    times = []
+    gc.disable()
+    try:
+        for number in range(BOOKINGS):
+            taxi_id = taxi_ids[number * 7919 % fleet_size]  # Spread over the fleet, not only its first taxis
+            started = time.perf_counter()
+            system.request_ride(f"078{number:07d}", taxi_id)
+            times.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return statistics.median(times)
+
+
+def check_latency():
+    latencies = {fleet_size: median_latency(fleet_size) for fleet_size in FLEETS}
+    slowdown = latencies[FLEETS[-1]] / latencies[FLEETS[0]]
+    assert slowdown < LIMIT, f"request_ride is {slowdown:.1f}x slower with {FLEETS[-1]} taxis than with {FLEETS[0]}"
+    return latencies
+
+
+def test_request_ride_latency_is_flat_from_10_to_100k_taxis():
+    check_latency()
+
+
+if __name__ == "__main__":
+    for fleet_size, latency in check_latency().items():
+        print(f"{fleet_size} taxis: {latency * 1e6:.1f} us per booking")